@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.synthetic import generate_schema_args
+from src.cache import GENERATOR_VERSION, LOGO_FILENAMES
+from src.compiler import compile_pdf
+from src.generator import generate_dependencies, generate_options, generate_style, generate_first_page, \
+    generate_document_description, generate_document_versions_table, generate_toc, generate_organigram, \
+    generate_deliverables, generate_user_stories, generate_work_report_page, generate_stats, generate_pld
+from src.model import PLDRecord, to_record
+from src.schema import PLDSchema, LocaleDictionary
+from pylatex import Document, Command
+
+LOADING_PHASES: List[str] = ["json_load", "validation", "to_record"]
+# Each path renders the whole PLD on its own, the statistics are only timed for reference since the description and
+# the advancement report compute them again
+PATH_PHASES: Dict[str, List[str]] = {
+    "in_memory": ["generate_dependencies", "generate_options", "generate_style", "generate_first_page",
+                  "generate_document_description", "generate_document_versions_table", "generate_toc",
+                  "generate_organigram", "generate_deliverables", "generate_user_stories",
+                  "generate_work_report_page", "generate_tex"],
+    "fragments": ["generate_pld_fragments", "generate_tex_fragments"],
+    "cached_fragments": ["generate_pld_cached_fragments", "generate_tex_fragments"],
+}
+
+
+def measure(timings: Dict[str, float], phase: str, function: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    result = function()
+    timings[phase] = time.perf_counter() - start
+    return result
+
+
+def write_placeholder_logo(filepath: str) -> None:
+    # Smallest valid PDF with an empty square page, the document only needs a graphic to include
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+               b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 100 100] /Resources << >> >>"]
+    content = b"%PDF-1.4\n"
+    offsets: List[int] = []
+    for n_object, pdf_object in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += b"%d 0 obj\n%s\nendobj\n" % (n_object, pdf_object)
+    xref = len(content)
+    content += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    content += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    content += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(filepath, "wb") as file:
+        file.write(content)
+
+
+def run_benchmark(sizes: Dict[str, int], locale: LocaleDictionary, build_dir: str, pdf: bool,
+                  breakable: bool = False) -> Dict[str, float]:
+    timings: Dict[str, float] = dict()
+    schema_text = json.dumps(generate_schema_args(**sizes))
+    schema_args = measure(timings, "json_load", lambda: json.loads(schema_text))
+    validated_schema: PLDSchema = measure(timings, "validation", lambda: PLDSchema(**schema_args))
+    schema: PLDRecord = measure(timings, "to_record", lambda: to_record(validated_schema))
+    document = Document("pld", geometry_options={"left": "20mm", "top": "20mm"},
+                        documentclass=Command("documentclass", arguments=["extarticle"],
+                                              options=["a4paper", "12pt", "table"]),
+                        fontenc="T1", inputenc="utf8", page_numbers=True)
+    measure(timings, "generate_stats", lambda: generate_stats(schema))
+    measure(timings, "generate_dependencies", lambda: generate_dependencies(document))
+    measure(timings, "generate_options", lambda: generate_options(document))
+    measure(timings, "generate_style", lambda: generate_style(schema, locale, document))
+    measure(timings, "generate_first_page", lambda: generate_first_page(schema, document))
+    measure(timings, "generate_document_description", lambda: generate_document_description(schema, locale, document))
+    measure(timings, "generate_document_versions_table",
+            lambda: generate_document_versions_table(schema, locale, document))
+    measure(timings, "generate_toc", lambda: generate_toc(locale, document))
+    measure(timings, "generate_organigram", lambda: generate_organigram(schema, locale, document))
+    measure(timings, "generate_deliverables", lambda: generate_deliverables(schema, locale, document, breakable))
+    measure(timings, "generate_user_stories", lambda: generate_user_stories(schema, locale, document, breakable))
+    measure(timings, "generate_work_report_page", lambda: generate_work_report_page(schema, locale, document))
+    filepath = os.path.join(build_dir, "pld")
+    measure(timings, "generate_tex", lambda: document.generate_tex(filepath))
+    # The command line renders through cached section fragments, timed once written and once reused
+    measure(timings, "generate_pld_fragments", lambda: generate_pld(schema, locale, build_dir, breakable=breakable))
+    fragment_document: Document = measure(timings, "generate_pld_cached_fragments",
+                                          lambda: generate_pld(schema, locale, build_dir, breakable=breakable))
+    measure(timings, "generate_tex_fragments", lambda: fragment_document.generate_tex(filepath))
+    if pdf:
+        for logo_filename in LOGO_FILENAMES:
+            write_placeholder_logo(os.path.join(build_dir, logo_filename))
+        measure(timings, "generate_pdf", lambda: compile_pdf(f"{filepath}.tex"))
+    return timings
+
+
+def parse_size(size: str) -> Dict[str, int]:
+    deliverables, subsets, user_stories, authors, versions = [int(value) for value in size.split("x")]
+    return {"deliverables": deliverables, "subsets": subsets, "user_stories": user_stories, "authors": authors,
+            "versions": versions}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time each phase of the PLD generation on synthetic schemas")
+    parser.add_argument("sizes", nargs="*", default=["2x2x5x3x2", "5x4x10x10x10", "10x5x40x30x50"],
+                        help="DELIVERABLESxSUBSETSxUSER_STORIESxAUTHORSxVERSIONS, user stories are per subset")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="keep the fastest of REPEAT runs per phase")
+    parser.add_argument("-p", "--pdf", action='store_true', help="also time the LaTeX compilation")
+    parser.add_argument("-b", "--breakable-tables", action='store_true',
+                        help="typeset the deliverable map and the user stories with breakable tables")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file instead of stdout")
+    args = parser.parse_args()
+    with open(str(Path(__file__).parent.parent.joinpath("src", "locale", "fr_FR.json")), "r") as file:
+        locale = LocaleDictionary(**json.load(file))
+    results: List[Dict[str, Any]] = []
+    for size in args.sizes:
+        sizes = parse_size(size)
+        runs: List[Dict[str, float]] = []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as build_dir:
+                runs.append(run_benchmark(sizes, locale, build_dir, args.pdf, args.breakable_tables))
+        timings = {phase: min(run[phase] for run in runs) for phase in runs[0]}
+        results.append({"sizes": sizes,
+                        "user_stories": sizes["deliverables"] * sizes["subsets"] * sizes["user_stories"],
+                        "timings": timings,
+                        "totals": {path: sum(timings[phase] for phase in LOADING_PHASES + phases)
+                                   for path, phases in PATH_PHASES.items()}})
+    report = json.dumps({"generator_version": GENERATOR_VERSION, "python": platform.python_version(),
+                         "platform": platform.platform(), "repeat": args.repeat,
+                         "breakable_tables": args.breakable_tables, "results": results}, indent=2)
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            file.write(report)
+    else:
+        print(report)
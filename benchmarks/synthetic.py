@@ -0,0 +1,47 @@
+import datetime
+import random
+from typing import Any, Dict, List
+
+STATUSES: List[str] = ["To do", "WIP", "Done", "Abandoned"]
+
+
+def generate_schema_args(deliverables: int, subsets: int, user_stories: int, authors: int, versions: int,
+                         seed: int = 0) -> Dict[str, Any]:
+    generator = random.Random(seed)
+    author_names = [f"Author{n_author} Lastname{n_author}" for n_author in range(1, authors + 1)]
+    first_date = datetime.date(2020, 1, 1)
+    return {
+        "locale": "fr_FR",
+        "title": "Synthetic project",
+        "subtitle": "Benchmark",
+        "description": "Synthetic Project Log Document used to benchmark the generator",
+        "authors": author_names,
+        "versions": [{
+            "version": f"{n_version // 100}.{n_version // 10 % 10}.{n_version % 10}",
+            "date": (first_date + datetime.timedelta(days=n_version)).isoformat(),
+            "authors": generator.sample(author_names, k=min(2, authors)),
+            "sections": "All",
+            "comment": f"Version {n_version}"
+        } for n_version in range(versions)],
+        "deliverables": [{
+            "name": f"Deliverable {n_deliverable}",
+            "description": f"Description of deliverable {n_deliverable}",
+            "subsets": [{
+                "name": f"Subset {n_deliverable}.{n_subset}",
+                "description": f"Description of subset {n_deliverable}.{n_subset}",
+                "user_stories": [{
+                    "name": f"User story {n_deliverable}.{n_subset}.{n_user_story}",
+                    "user": "user",
+                    "action": f"do action {n_user_story}",
+                    "description": f"Detailed description of user story {n_user_story}",
+                    "definitions_of_done": [f"Goal {n_goal}" for n_goal in range(1, 4)],
+                    "estimated_duration": generator.randint(1, 10) / 2,
+                    "status": generator.choice(STATUSES),
+                    # Assignments use first names only so they exercise partial author name resolution
+                    "assignments": [author.split(" ")[0] for author in
+                                    generator.sample(author_names, k=min(generator.randint(1, 3), authors))],
+                    "comments": [f"Comment {n_comment}" for n_comment in range(generator.randint(0, 2))]
+                } for n_user_story in range(1, user_stories + 1)]
+            } for n_subset in range(1, subsets + 1)]
+        } for n_deliverable in range(1, deliverables + 1)]
+    }
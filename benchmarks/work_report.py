@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import platform
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.synthetic import generate_schema_args
+from src.cache import GENERATOR_VERSION
+from src.generator import Fragment, generate_work_report_page
+from src.model import to_record
+from src.schema import PLDSchema, LocaleDictionary
+from src.stats import aggregate_authors
+
+DELIVERABLES = 10
+SUBSETS = 5
+
+
+def run_work_report(user_stories: int, authors: int, locale: LocaleDictionary, repeat: int) -> Dict[str, Any]:
+    per_subset = max(user_stories // (DELIVERABLES * SUBSETS), 1)
+    schema = to_record(PLDSchema(**generate_schema_args(DELIVERABLES, SUBSETS, per_subset, authors, 1)))
+    timings: Dict[str, float] = {"aggregate_authors": float("inf"), "generate_work_report_page": float("inf")}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        author_stats = aggregate_authors(schema)
+        timings["aggregate_authors"] = min(timings["aggregate_authors"], time.perf_counter() - start)
+        start = time.perf_counter()
+        generate_work_report_page(schema, locale, Fragment(), author_stats).dumps()
+        timings["generate_work_report_page"] = min(timings["generate_work_report_page"], time.perf_counter() - start)
+    return {"user_stories": DELIVERABLES * SUBSETS * per_subset, "authors": authors, "timings": timings,
+            "total": sum(timings.values())}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that the advancement report stays linear in the number of "
+                                                 "user stories")
+    parser.add_argument("user_stories", nargs="*", type=int, default=[1000, 4000, 16000],
+                        help="numbers of user stories to time, in increasing order")
+    parser.add_argument("-a", "--authors", type=int, default=30, help="number of authors of the synthetic PLD")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="keep the fastest of REPEAT runs")
+    parser.add_argument("-t", "--tolerance", type=float, default=2.0,
+                        help="fail if the time per user story of the largest PLD exceeds the one of the smallest "
+                             "PLD by more than this factor")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file instead of stdout")
+    args = parser.parse_args()
+    with open(str(Path(__file__).parent.parent.joinpath("src", "locale", "fr_FR.json")), "r") as file:
+        locale = LocaleDictionary(**json.load(file))
+    results: List[Dict[str, Any]] = [run_work_report(user_stories, args.authors, locale, args.repeat)
+                                     for user_stories in args.user_stories]
+    per_user_story = [result["total"] / result["user_stories"] for result in results]
+    ratio = per_user_story[-1] / per_user_story[0]
+    report = json.dumps({"generator_version": GENERATOR_VERSION, "python": platform.python_version(),
+                         "platform": platform.platform(), "repeat": args.repeat, "results": results,
+                         "ratio": ratio, "tolerance": args.tolerance}, indent=2)
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            file.write(report)
+    else:
+        print(report)
+    if ratio > args.tolerance:
+        print(f"The time per user story grew {ratio:.2f} times from {results[0]['user_stories']} to "
+              f"{results[-1]['user_stories']} user stories, more than the {args.tolerance:g} times tolerated")
+        quit(1)
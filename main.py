@@ -1,37 +1,104 @@
 #!/usr/bin/env python3
-import json
 import argparse
-import glob
 import os
+from typing import TYPE_CHECKING
 
-from src.generator import generate_pld
-from pathlib import Path
+from src.inputs import collect_schema_filepaths
+
+if TYPE_CHECKING:
+    from src.render import RenderOptions
+
+
+def get_render_options(args: argparse.Namespace) -> "RenderOptions":
+    from src.render import RenderOptions
+    # Each locale renders in its own directory, a locale given twice would have two threads writing the same files
+    locales = tuple(dict.fromkeys(args.locales.split(","))) if args.locales else ()
+    return RenderOptions(args.assets_dir, args.force, args.compiler, args.split, not args.strict,
+                         args.breakable_tables, locales)
 
-from src.schema import PLDSchema, LocaleDictionary
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
+    parser.add_argument("inputs", nargs="*", default=["assets"],
+                        help="PLD json files or directories containing them (default: assets)")
     parser.add_argument("-s", "--schema", help="only generate json schema", action='store_true')
+    parser.add_argument("--validate", action='store_true',
+                        help="only check that the PLD json files are valid, without rendering them")
+    parser.add_argument("-f", "--force", help="render even if a cached build is up to date", action='store_true')
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="maximum number of documents rendered in parallel (default: number of CPUs)")
+    parser.add_argument("-o", "--build-dir", default="build",
+                        help="output directory, one subdirectory per document when rendering several")
+    parser.add_argument("-a", "--assets-dir", default="assets", help="directory containing the shared logos")
+    parser.add_argument("--compile-server", metavar="SOCKET",
+                        help="run a LaTeX compile server with a precompiled preamble on this unix socket")
+    parser.add_argument("--compiler", metavar="SOCKET", help="send compilations to the compile server on this socket")
+    parser.add_argument("--http", metavar="[HOST:]PORT",
+                        help="run an HTTP render service queueing PLD json files, rendered in BUILD_DIR/jobs")
+    parser.add_argument("--split", action='store_true',
+                        help="compile each deliverable as its own unit in parallel, then merge them")
+    parser.add_argument("--breakable-tables", action='store_true',
+                        help="typeset the deliverable map and the user stories with tables that can break across pages")
+    parser.add_argument("-l", "--locales", metavar="LOCALE,...",
+                        help="render the PLD in each of these locales, in BUILD_DIR/<locale>, instead of its own")
+    parser.add_argument("-w", "--watch", action='store_true',
+                        help="keep running and render again whenever the PLD json file or the logos change")
+    parser.add_argument("--strict", action='store_true',
+                        help="validate the PLD json files even if their content was already validated")
+    parser.add_argument("--profile", action='store_true',
+                        help="save a timing trace of each render in its build directory")
+    parser.add_argument("--profile-output", metavar="FILENAME",
+                        help="name of the timing trace, implies --profile: a Chrome trace if FILENAME ends with .json "
+                             "(default: profile.json), folded stacks otherwise")
     args = parser.parse_args()
-    if args.schema:
-        with open("pld_schema.json", "w") as file:
-            file.write(PLDSchema.schema_json(indent=2))
-        with open("locale_schema.json", "w") as file:
-            file.write(LocaleDictionary.schema_json(indent=2))
+    # Modules are imported by the mode using them, pylatex is only loaded when something is rendered
+    if args.compile_server is not None:
+        from src.compiler import serve
+        serve(args.compile_server, args.jobs)
+    elif args.http is not None:
+        from src.service import serve_http
+        serve_http(args.http, os.path.join(args.build_dir, "jobs"), get_render_options(args)._replace(locales=()),
+                   args.jobs)
+    elif args.schema:
+        from src.cache import write_schema_files
+        write_schema_files()
     else:
-        schema_args = json.load(open(glob.glob("assets/*.json")[0]))
-        schema = PLDSchema(**schema_args)
-        locale_args = json.load(open(str(Path("src/locale").joinpath(f"{schema.locale.value}.json"))))
-        locale = LocaleDictionary(**locale_args)
-        document = generate_pld(schema, locale)
-        tex_filepath = "build/pld.tex"
-        pdf_filepath = "build/pld.pdf"
-        try:
-            os.mkdir("build")
-        except FileExistsError:
-            pass
-        document.generate_tex(tex_filepath)
-        document.generate_pdf(pdf_filepath, clean_tex=True)
-        print(f"LaTeX file saved at ./{tex_filepath}")
-        print(f"PDF file saved at ./{pdf_filepath}")
+        schema_filepaths = collect_schema_filepaths(args.inputs)
+        if len(schema_filepaths) == 0:
+            print("No PLD json file found")
+            quit(1)
+        if args.validate:
+            from src.loader import validate_schema_file
+            errors = [(schema_filepath, validate_schema_file(schema_filepath, not args.strict))
+                      for schema_filepath in schema_filepaths]
+            for schema_filepath, error in errors:
+                print(f"valid {schema_filepath}" if error is None else f"INVALID {schema_filepath}\n{error}")
+            quit(1 if any(error is not None for _, error in errors) else 0)
+        missing_filepaths = [schema_filepath for schema_filepath in schema_filepaths
+                             if not os.path.isfile(schema_filepath)]
+        if len(missing_filepaths) > 0:
+            print(f"No such PLD json file: {', '.join(missing_filepaths)}")
+            quit(1)
+        options = get_render_options(args)
+        profile_filename = args.profile_output or ("profile.json" if args.profile else None)
+        if args.watch:
+            if len(schema_filepaths) > 1:
+                print("Watch mode renders a single PLD json file")
+                quit(1)
+            if args.locales:
+                print("Watch mode renders a PLD in its own locale only, --locales is not supported")
+                quit(1)
+            from src.watch import watch
+            try:
+                watch(schema_filepaths[0], args.build_dir, options, profile_filename)
+            except KeyboardInterrupt:
+                quit(0)
+        from src.batch import render_batch
+        results = render_batch(schema_filepaths, args.build_dir, options, args.jobs, profile_filename)
+        failures = [result for result in results if result.error is not None]
+        for failure in failures:
+            print(f"\n{failure.schema_filepath}:\n{failure.error}")
+        print(f"{len(results) - len(failures)}/{len(results)} PLD generated "
+              f"in {sum(result.duration for result in results):.2f}s of rendering time")
+        quit(1 if len(failures) > 0 else 0)
     quit(0)
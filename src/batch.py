@@ -0,0 +1,92 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Dict, Tuple
+
+from src.profiling import Profiler, profiling
+from src.compiler import CompileResult
+from src.render import RenderOptions, render_pld, render_locales
+
+
+class RenderResult(NamedTuple):
+    schema_filepath: str
+    build_dir: str
+    duration: float
+    rendered: bool
+    passes: int
+    error: Optional[str]
+    locales: Tuple[str, ...] = ()
+
+
+def get_build_dirs(schema_filepaths: List[str], build_dir: str) -> Dict[str, str]:
+    if len(schema_filepaths) == 1:
+        return {schema_filepaths[0]: build_dir}
+    build_dirs: Dict[str, str] = dict()
+    for schema_filepath in schema_filepaths:
+        name = Path(schema_filepath).stem
+        n_duplicate = 1
+        while os.path.join(build_dir, name) in build_dirs.values():
+            n_duplicate += 1
+            name = f"{Path(schema_filepath).stem}-{n_duplicate}"
+        build_dirs[schema_filepath] = os.path.join(build_dir, name)
+    return build_dirs
+
+
+def render_results(schema_filepath: str, build_dir: str,
+                   options: RenderOptions) -> List[Tuple[str, Optional[CompileResult]]]:
+    if len(options.locales) == 0:
+        return [("", render_pld(schema_filepath, build_dir, options))]
+    return render_locales(schema_filepath, build_dir, options)
+
+
+def render_job(schema_filepath: str, build_dir: str, options: RenderOptions,
+               profile_filename: Optional[str]) -> RenderResult:
+    start = time.perf_counter()
+    try:
+        if profile_filename is None:
+            compile_results = render_results(schema_filepath, build_dir, options)
+        else:
+            with profiling(Profiler()) as profiler:
+                compile_results = render_results(schema_filepath, build_dir, options)
+            profiler.save(os.path.join(build_dir, profile_filename))
+    except Exception:
+        return RenderResult(schema_filepath, build_dir, time.perf_counter() - start, False, 0, traceback.format_exc(),
+                            options.locales)
+    # Locales are compiled concurrently, so the slowest one tells how many passes the render waited for
+    passes = max(compile_result.passes if compile_result is not None else 0 for _, compile_result in compile_results)
+    rendered = any(compile_result is not None for _, compile_result in compile_results)
+    return RenderResult(schema_filepath, build_dir, time.perf_counter() - start, rendered, passes, None,
+                        options.locales)
+
+
+def render_batch(schema_filepaths: List[str], build_dir: str = "build", options: RenderOptions = RenderOptions(),
+                 jobs: Optional[int] = None, profile_filename: Optional[str] = None) -> List[RenderResult]:
+    build_dirs = get_build_dirs(schema_filepaths, build_dir)
+    results: List[RenderResult] = []
+    if len(schema_filepaths) == 1 or jobs == 1:
+        for schema_filepath in schema_filepaths:
+            result = render_job(schema_filepath, build_dirs[schema_filepath], options, profile_filename)
+            print(format_result(result))
+            results.append(result)
+        return results
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(render_job, schema_filepath, build_dirs[schema_filepath], options, profile_filename)
+                   for schema_filepath in schema_filepaths]
+        for future in as_completed(futures):
+            result = future.result()
+            print(format_result(result))
+            results.append(result)
+    return results
+
+
+def format_result(result: RenderResult) -> str:
+    if result.error is not None:
+        return f"FAILED {result.schema_filepath} after {result.duration:.2f}s"
+    pdf_filepaths = ", ".join([f"./{os.path.join(result.build_dir, locale, 'pld.pdf')}"
+                               for locale in result.locales or ("",)])
+    if not result.rendered:
+        return f"up to date {result.schema_filepath} -> {pdf_filepaths}"
+    return (f"rendered {result.schema_filepath} -> {pdf_filepaths} in {result.duration:.2f}s "
+            f"({result.passes} LaTeX passes)")
@@ -0,0 +1,99 @@
+import datetime
+import functools
+import json
+import os
+import shutil
+from hashlib import md5
+from importlib import metadata
+from pathlib import Path
+from typing import List, Optional, TYPE_CHECKING
+
+# Kept to the standard library at runtime so the command line can check its inputs before loading pydantic or pylatex
+if TYPE_CHECKING:
+    from src.model import PLDRecord
+    from src.schema import LocaleDictionary
+
+GENERATOR_VERSION = "0.0.1"
+LOGO_FILENAMES: List[str] = ["primary_logo.pdf", "secondary_logo.pdf"]
+RENDER_HASH_FILENAME = "pld.hash"
+# Every module whose code ends up shaping the generated LaTeX
+GENERATOR_SOURCE_FILENAMES: List[str] = ["generator.py", "organigram.py", "stats.py", "model.py", "schema.py"]
+SCHEMA_FILENAMES: List[str] = ["pld_schema.json", "locale_schema.json"]
+
+
+def get_cache_dir(name: str) -> str:
+    cache_dir = os.path.join(os.environ.get("PLD_CACHE_DIR", os.path.join(Path.home(), ".cache", "pld-generator")),
+                             name)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+@functools.lru_cache(maxsize=None)
+def get_source_digest(filename: str) -> str:
+    return md5(Path(__file__).parent.joinpath(filename).read_bytes()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def get_generator_digest() -> str:
+    digest = md5()
+    for filename in GENERATOR_SOURCE_FILENAMES:
+        digest.update(get_source_digest(filename).encode())
+    return digest.hexdigest()
+
+
+def compute_render_hash(schema: "PLDRecord", locale: "LocaleDictionary", logo_filepaths: List[Optional[str]],
+                        breakable: bool = False, split: bool = False) -> str:
+    digest = md5()
+    digest.update(GENERATOR_VERSION.encode())
+    # Generator changes must invalidate previously rendered documents even without a version bump
+    digest.update(get_generator_digest().encode())
+    # Records only hold strings, numbers, statuses and dates, the latter serialized as ISO dates by str
+    digest.update(json.dumps(schema, default=str).encode())
+    digest.update(locale.json(sort_keys=True).encode())
+    # The title page embeds the generation date
+    digest.update(datetime.date.today().isoformat().encode())
+    # Both modes lay out the same PDF with different page breaks and links
+    digest.update(str(breakable).encode())
+    digest.update(str(split).encode())
+    for logo_filename, logo_filepath in zip(LOGO_FILENAMES, logo_filepaths):
+        digest.update(logo_filename.encode())
+        if logo_filepath is not None:
+            digest.update(Path(logo_filepath).read_bytes())
+    return digest.hexdigest()
+
+
+def read_render_hash(build_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(build_dir, RENDER_HASH_FILENAME), "r") as file:
+            return file.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def write_render_hash(build_dir: str, render_hash: str) -> None:
+    with open(os.path.join(build_dir, RENDER_HASH_FILENAME), "w") as file:
+        file.write(render_hash)
+
+
+def is_render_cached(build_dir: str, pdf_filepath: str, render_hash: str) -> bool:
+    return os.path.isfile(pdf_filepath) and read_render_hash(build_dir) == render_hash
+
+
+def get_schema_cache_dir() -> str:
+    # The JSON schemas only change with the models and the pydantic version generating them
+    digest = md5(get_source_digest("schema.py").encode())
+    digest.update(metadata.version("pydantic").encode())
+    return get_cache_dir(os.path.join("schemas", digest.hexdigest()))
+
+
+def write_schema_files(output_dir: str = ".") -> None:
+    cache_dir = get_schema_cache_dir()
+    if not all(os.path.isfile(os.path.join(cache_dir, filename)) for filename in SCHEMA_FILENAMES):
+        from src.schema import PLDSchema, LocaleDictionary
+        for filename, model in zip(SCHEMA_FILENAMES, [PLDSchema, LocaleDictionary]):
+            temporary_filepath = os.path.join(cache_dir, f"{filename}.{os.getpid()}")
+            with open(temporary_filepath, "w") as file:
+                file.write(model.schema_json(indent=2))
+            os.replace(temporary_filepath, os.path.join(cache_dir, filename))
+    for filename in SCHEMA_FILENAMES:
+        shutil.copyfile(os.path.join(cache_dir, filename), os.path.join(output_dir, filename))
@@ -0,0 +1,192 @@
+import functools
+import json
+import os
+import subprocess
+import threading
+import time
+import traceback
+import uuid
+from hashlib import md5
+from multiprocessing.connection import Listener, Client, Connection
+from pathlib import Path
+from typing import NamedTuple, Optional, List
+
+from src.cache import get_cache_dir
+from src.profiling import profile
+
+# mylatexformat stops dumping the format at this line, everything after it is document specific
+PREAMBLE_DUMP_MARKER = "%endofdump\n"
+# Files read back by the next pass: labels (LastPage), table of contents and hyperref bookmarks
+AUXILIARY_EXTENSIONS: List[str] = ["aux", "toc", "out"]
+MAX_PASSES = 5
+# pdflatex reports the error at the end of its output, the beginning only lists the packages it loaded
+LOG_TAIL_LINES = 30
+
+
+class CompileResult(NamedTuple):
+    pdf_filepath: str
+    duration: float
+    passes: int
+    error: Optional[str]
+
+
+class LatexError(subprocess.CalledProcessError):
+    def __str__(self) -> str:
+        lines = self.output.decode(errors="replace").rstrip().split("\n")
+        return f"{super().__str__()}\n" + "\n".join(lines[-LOG_TAIL_LINES:])
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine_version() -> str:
+    try:
+        return subprocess.run(["pdflatex", "--version"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              check=True).stdout.decode().split("\n")[0]
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def get_format_filepath(tex_filepath: str, format_dir: str) -> Optional[str]:
+    with open(tex_filepath, "r") as file:
+        tex = file.read()
+    index = tex.find(PREAMBLE_DUMP_MARKER)
+    if index == -1:
+        return None
+    key = md5((get_engine_version() + tex[:index]).encode()).hexdigest()
+    return os.path.join(format_dir, f"pld-{key}.fmt")
+
+
+def build_format(tex_filepath: str, format_filepath: str) -> bool:
+    if os.path.isfile(format_filepath):
+        return True
+    format_dir = os.path.dirname(format_filepath)
+    # Concurrent builds of the same format each dump under their own name before the atomic rename
+    jobname = f"{Path(format_filepath).stem}-{uuid.uuid4().hex}"
+    command = ["pdflatex", "-ini", "-interaction=nonstopmode", f"-jobname={jobname}", "&pdflatex",
+               "mylatexformat.ltx", os.path.abspath(tex_filepath)]
+    try:
+        with profile("build_format"):
+            subprocess.run(command, cwd=format_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           check=True)
+        os.replace(os.path.join(format_dir, f"{jobname}.fmt"), format_filepath)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    finally:
+        for extension in ["log", "fmt"]:
+            try:
+                os.remove(os.path.join(format_dir, f"{jobname}.{extension}"))
+            except FileNotFoundError:
+                pass
+    return True
+
+
+def get_auxiliary_digest(tex_filepath: str) -> str:
+    digest = md5()
+    for extension in AUXILIARY_EXTENSIONS:
+        auxiliary_filepath = Path(tex_filepath).with_suffix(f".{extension}")
+        digest.update(extension.encode())
+        if auxiliary_filepath.is_file():
+            digest.update(auxiliary_filepath.read_bytes())
+    return digest.hexdigest()
+
+
+def run_pdflatex(tex_filepath: str, format_filepath: Optional[str]) -> None:
+    command = ["pdflatex", "-interaction=nonstopmode"]
+    if format_filepath is not None:
+        command.append(f"-fmt={format_filepath}")
+    command.append(os.path.basename(tex_filepath))
+    try:
+        subprocess.run(command, cwd=os.path.dirname(os.path.abspath(tex_filepath)), stdout=subprocess.PIPE,
+                       stderr=subprocess.STDOUT, check=True)
+    except subprocess.CalledProcessError as e:
+        raise LatexError(e.returncode, e.cmd, e.output) from None
+
+
+def run_passes(tex_filepath: str, format_filepath: Optional[str], max_passes: int) -> int:
+    # Auxiliary files left by the previous build are reused, so a body-only change converges after one pass
+    digest = get_auxiliary_digest(tex_filepath)
+    for passes in range(1, max_passes + 1):
+        with profile(f"pdflatex {Path(tex_filepath).stem} pass {passes}"):
+            run_pdflatex(tex_filepath, format_filepath)
+        new_digest = get_auxiliary_digest(tex_filepath)
+        if new_digest == digest:
+            return passes
+        digest = new_digest
+    return max_passes
+
+
+def compile_pdf(tex_filepath: str, format_dir: Optional[str] = None, max_passes: int = MAX_PASSES) -> CompileResult:
+    start = time.perf_counter()
+    pdf_filepath = str(Path(tex_filepath).with_suffix(".pdf"))
+    format_filepath = get_format_filepath(tex_filepath, format_dir) if format_dir is not None else None
+    if format_filepath is not None and not build_format(tex_filepath, format_filepath):
+        format_filepath = None
+    if format_filepath is None:
+        return CompileResult(pdf_filepath, time.perf_counter() - start, run_passes(tex_filepath, None, max_passes),
+                             None)
+    try:
+        passes: Optional[int] = run_passes(tex_filepath, format_filepath, max_passes)
+    except subprocess.CalledProcessError:
+        # The format may have been dumped by another TeX installation, which only shows once compiled without it
+        passes = None
+    # Retried outside of the handler, so a failing retry reports its own log only
+    if passes is None:
+        passes = run_passes(tex_filepath, None, max_passes)
+        # Only a format that failed where the compile without it succeeds is broken, errors in the document body
+        # fail both ways and keep the format
+        try:
+            os.remove(format_filepath)
+        except FileNotFoundError:
+            pass
+    return CompileResult(pdf_filepath, time.perf_counter() - start, passes, None)
+
+
+def run_compile_job(tex_filepath: str, format_dir: str) -> CompileResult:
+    start = time.perf_counter()
+    try:
+        return compile_pdf(tex_filepath, format_dir)
+    except Exception:
+        return CompileResult(str(Path(tex_filepath).with_suffix(".pdf")), time.perf_counter() - start, 0,
+                             traceback.format_exc())
+
+
+def handle_connection(connection: Connection, semaphore: threading.BoundedSemaphore, format_dir: str) -> None:
+    # Requests and results are plain JSON rather than pickles, so a client cannot make the server run any code
+    with connection:
+        while True:
+            try:
+                tex_filepath = json.loads(connection.recv_bytes())
+            except (EOFError, ValueError):
+                return
+            if not isinstance(tex_filepath, str):
+                return
+            with semaphore:
+                result = run_compile_job(tex_filepath, format_dir)
+            connection.send_bytes(json.dumps(result._asdict()).encode())
+
+
+def remove_stale_socket(address: str) -> None:
+    if not os.path.exists(address):
+        return
+    try:
+        Client(address).close()
+    except ConnectionRefusedError:
+        os.remove(address)
+
+
+def serve(address: str, workers: Optional[int] = None) -> None:
+    format_dir = get_cache_dir("formats")
+    semaphore = threading.BoundedSemaphore(workers or os.cpu_count() or 1)
+    remove_stale_socket(address)
+    with Listener(address) as listener:
+        # Only the user running the server may submit documents to compile
+        os.chmod(address, 0o600)
+        print(f"Compile server listening on {address}")
+        while True:
+            connection = listener.accept()
+            threading.Thread(target=handle_connection, args=(connection, semaphore, format_dir), daemon=True).start()
+
+
+def submit_compile(address: str, tex_filepath: str) -> CompileResult:
+    with Client(address) as connection:
+        connection.send_bytes(json.dumps(os.path.abspath(tex_filepath)).encode())
+        return CompileResult(**json.loads(connection.recv_bytes()))
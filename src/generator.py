@@ -1,14 +1,39 @@
 import datetime
+import json
+import os
 from hashlib import md5
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional, Callable, Any, Iterable, Iterator
 
 from pylatex import Document, Package, Command, NewLine, Center, VerticalSpace, LargeText, Figure, Section, Tabularx, \
-    MultiColumn, NewPage, TikZ, TikZOptions, TikZNode, TikZDraw, TikZPathList, Subsection, MediumText, Subsubsection, \
-    Itemize, MiniPage, Head, Foot, PageStyle, StandAloneGraphic, simple_page_number, UnsafeCommand
+    MultiColumn, NewPage, Subsection, MediumText, Subsubsection, Itemize, MiniPage, Head, Foot, PageStyle, \
+    StandAloneGraphic, simple_page_number, UnsafeCommand, LongTable, Tabular
+from pylatex.base_classes import Container, LatexObject
 from pylatex.section import Paragraph
 from pylatex.utils import bold, NoEscape
+from pydantic.json import pydantic_encoder
 
-from src.schema import PLDSchema, Version, LocaleDictionary, UserStory
+from src.cache import GENERATOR_VERSION, get_generator_digest
+from src.compiler import PREAMBLE_DUMP_MARKER
+from src.organigram import generate_organigram_tikz, layout_organigram
+from src.profiling import profile
+from src.model import PLDRecord, UserStoryRecord, DeliverableRecord
+from src.schema import LocaleDictionary
+from src.stats import AuthorStats, aggregate_authors
+
+FRAGMENTS_DIRNAME = "sections"
+# Packages required by objects that only live inside fragments, so cached fragments do not need to be rebuilt
+FRAGMENT_PACKAGES: List[str] = ["ragged2e", "tikz", "graphicx", "longtable"]
+# Split units read their first page number and the total page count from <unit>.pages, written once the page count
+# of every unit is known, and the front matter reads the table of contents merged from every unit
+SPLIT_LAST_PAGE_COMMAND = "\\pldlastpage"
+SPLIT_CONTENTS_FILENAME = "pld-contents.toc"
+# The organigram and the deliverable map are numbered sections of the front matter
+SPLIT_FRONT_NUMBERED_SECTIONS = 2
+
+
+class Fragment(Container):
+    def dumps(self) -> str:
+        return self.dumps_content()
 
 
 def generate_options(document: Document) -> Document:
@@ -19,7 +44,8 @@ def generate_options(document: Document) -> Document:
     return document
 
 
-def generate_style(schema: PLDSchema, locale: LocaleDictionary, document: Document) -> Document:
+def generate_style(schema: PLDRecord, locale: LocaleDictionary, document: Document,
+                   last_page: str = "\\pageref{LastPage}") -> Document:
     document.preamble.append(UnsafeCommand("newcommand", Command("rowWidth"),
                                            extra_arguments=NoEscape("\\linewidth-(\\tabcolsep*2)")))
     document.preamble.append(
@@ -34,7 +60,7 @@ def generate_style(schema: PLDSchema, locale: LocaleDictionary, document: Docume
         right_header.append(LargeText(locale.project_log_document))
     with header.create(Foot("R")) as right_footer:
         right_footer: Foot
-        right_footer.append(NoEscape(f"{locale.page} \\thepage\\ {locale.of} \\pageref{{LastPage}}"))
+        right_footer.append(NoEscape(f"{locale.page} \\thepage\\ {locale.of} {last_page}"))
     with header.create(Foot("L")) as left_footer:
         left_footer: Foot
         left_footer.append(StandAloneGraphic("secondary_logo.pdf", NoEscape("width=100pt")))
@@ -52,7 +78,7 @@ def generate_style(schema: PLDSchema, locale: LocaleDictionary, document: Docume
 
 
 def generate_dependencies(document: Document) -> Document:
-    dependencies: List[str] = ["svg", "amsmath", "fancyhdr", "hyperref", "tgbonum", "tabularx", "colortbl",
+    dependencies: List[str] = ["amsmath", "fancyhdr", "hyperref", "tgbonum", "tabularx", "colortbl",
                                "environ", "calc", "needspace", "tocbibind", "adjustbox", "enumitem", "xcolor"]
     dependencies_with_options: List[Tuple[str, str]] = [("xcolor", "table"), ("forest", "linguistics")]
     for name, options in dependencies_with_options:
@@ -63,7 +89,7 @@ def generate_dependencies(document: Document) -> Document:
     return document
 
 
-def generate_first_page(schema: PLDSchema, document: Document) -> Document:
+def generate_first_page(schema: PLDRecord, document: Document) -> Document:
     document.append(LargeText(Command("maketitle")))
     document.append(VerticalSpace("4cm"))
     with document.create(Center()) as center:
@@ -72,29 +98,17 @@ def generate_first_page(schema: PLDSchema, document: Document) -> Document:
     return document
 
 
-def get_user_story_priority(user_story: UserStory) -> int:
-    return user_story.status.to_priority()
-
-
-def generate_work_report_page(schema: PLDSchema, locale: LocaleDictionary, document: Document) -> Document:
-    authors_user_stories = dict()
-    for deliverable in schema.deliverables:
-        for subset in deliverable.subsets:
-            for user_story in subset.user_stories:
-                for author in user_story.assignments:
-                    for saved_author in schema.authors:
-                        if author in saved_author:
-                            if saved_author in authors_user_stories:
-                                authors_user_stories[saved_author].append(user_story)
-                            else:
-                                authors_user_stories[saved_author] = [user_story]
+def generate_work_report_page(schema: PLDRecord, locale: LocaleDictionary, document: Document,
+                              author_stats: Optional[AuthorStats] = None) -> Document:
+    if author_stats is None:
+        author_stats = aggregate_authors(schema)
     document.append(Command("setcounter", "secnumdepth", extra_arguments="0"))
     document.append(NewPage())
     with document.create(Section(title=locale.advancement_report)) as section:
         section: Section
 
-        for author, user_stories in authors_user_stories.items():
-            user_stories = sorted(user_stories, key=get_user_story_priority, reverse=True)
+        for author in author_stats.status_index.by_author:
+            user_stories = author_stats.status_index.get_user_stories(author)
             with section.create(Subsection(title=author)) as subsection:
                 subsection: Subsection
 
@@ -106,26 +120,17 @@ def generate_work_report_page(schema: PLDSchema, locale: LocaleDictionary, docum
     return document
 
 
-def generate_stats(schema: PLDSchema) -> Tuple[float, dict[str, float]]:
-    authors_score: Dict[str, float] = dict(zip(schema.authors, [float(0.0)] * len(schema.authors)))
-    total_score: float = float(0.0)
-    for deliverable in schema.deliverables:
-        for subset in deliverable.subsets:
-            for user_story in subset.user_stories:
-                total_score += user_story.estimated_duration
-                number_of_assigned_person = len(user_story.assignments)
-                estimated_man_days = user_story.estimated_duration / number_of_assigned_person
-                for author in user_story.assignments:
-                    for saved_author in schema.authors:
-                        if author in saved_author:
-                            authors_score[saved_author] += estimated_man_days
-                            break
-    return total_score, authors_score
-
-
-def generate_document_description(schema: PLDSchema, locale: LocaleDictionary, document: Document) -> Document:
+def generate_stats(schema: PLDRecord) -> Tuple[float, Dict[str, float]]:
+    author_stats = aggregate_authors(schema)
+    return author_stats.total_man_days, author_stats.man_days
+
+
+def generate_document_description(schema: PLDRecord, locale: LocaleDictionary, document: Document,
+                                  author_stats: Optional[AuthorStats] = None) -> Document:
     document.append(NewPage())
-    total_man_days, man_days_distribution = generate_stats(schema)
+    if author_stats is None:
+        author_stats = aggregate_authors(schema)
+    total_man_days, man_days_distribution = author_stats.total_man_days, author_stats.man_days
     with document.create(MiniPage()) as minipage:
         minipage: MiniPage
         with minipage.create(Section(title=locale.document_description)) as section:
@@ -145,7 +150,7 @@ def generate_document_description(schema: PLDSchema, locale: LocaleDictionary, d
     return document
 
 
-def generate_document_versions_table(schema: PLDSchema, locale: LocaleDictionary, document: Document) -> Document:
+def generate_document_versions_table(schema: PLDRecord, locale: LocaleDictionary, document: Document) -> Document:
     with document.create(Section(title=locale.revision_table)) as section:
         section: Section
         with section.create(Tabularx(table_spec="|l|l|X|X|X|", row_height="1.4")) as tabularx:
@@ -167,7 +172,18 @@ def generate_toc(locale: LocaleDictionary, document: Document) -> Document:
     return document
 
 
-def generate_organigram(schema: PLDSchema, locale: LocaleDictionary, document: Document) -> Document:
+def generate_merged_toc(locale: LocaleDictionary, document: Document) -> Document:
+    document.append(Command("setcounter", "secnumdepth", extra_arguments="50"))
+    document.append(Command("setcounter", "tocdepth", extra_arguments="50"))
+    document.append(NewPage())
+    document.append(Section(title=locale.table_of_content, numbering=False, label=False))
+    document.append(Command("addcontentsline", arguments=["toc", "section", locale.table_of_content]))
+    document.append(NoEscape(f"\\makeatletter\\InputIfFileExists{{{SPLIT_CONTENTS_FILENAME}}}{{}}{{}}\\makeatother"))
+    return document
+
+
+def generate_organigram(schema: PLDRecord, locale: LocaleDictionary, document: Document,
+                        organigram_filename: Optional[str] = None) -> Document:
     document.append(NewPage())
     with document.create(Figure()) as figure:
         figure: Figure
@@ -176,44 +192,32 @@ def generate_organigram(schema: PLDSchema, locale: LocaleDictionary, document: D
             section.append(Command("centering"))
             with section.create(Center()) as center:
                 center: Center
-                with center.create(TikZ()) as forest:
-                    forest: TikZ
-
-                    node_kwargs = {'align': 'center',
-                                   'minimum size': '20pt'}
-
-                    # noinspection PyTypeChecker
-                    top_box = TikZNode(text=schema.title,
-                                       handle=f"project-box",
-                                       options=TikZOptions('draw',
-                                                           'rounded corners',
-                                                           **node_kwargs))
-                    forest.append(top_box)
-                    last_box_handle = top_box.handle
-
-                    for n_deliverable, deliverable in enumerate(schema.deliverables, start=1):
-                        # noinspection PyTypeChecker
-                        box = TikZNode(text=f"{n_deliverable}. {deliverable.name}",
-                                       handle=f"deliverable-box-{n_deliverable}",
-                                       options=TikZOptions('draw',
-                                                           'rounded corners',
-                                                           f'below = of {last_box_handle}' if top_box.handle == last_box_handle else f'right = of {last_box_handle}',
-                                                           **node_kwargs))
-
-                        last_box_handle = box.handle
-                        # noinspection PyTypeChecker
-                        path = TikZDraw(TikZPathList(
-                            top_box.get_anchor_point("south"), "--", box.get_anchor_point("north")
-                        ))
-                        forest.append(box)
-                        forest.append(path)
+                if organigram_filename is not None:
+                    # Many deliverables make the organigram taller than the page, it is shrunk to fit within the float
+                    center.append(StandAloneGraphic(organigram_filename, image_options=NoEscape(
+                        "width=\\linewidth,height=0.8\\textheight,keepaspectratio")))
+                else:
+                    center.append(generate_organigram_tikz(
+                        layout_organigram(schema.title, [deliverable.name for deliverable in schema.deliverables])))
     document.append(VerticalSpace("2cm"))
     return document
 
 
-def generate_deliverables(schema: PLDSchema, locale: LocaleDictionary, document: Document) -> Document:
-    with document.create(MiniPage()) as minipage:
-        minipage: MiniPage
+def generate_table(columns: int, breakable: bool = False) -> Tabular:
+    if not breakable:
+        return Tabularx(table_spec=f"|{'|'.join(['X'] * columns)}|", row_height="1.4")
+    # Fixed width columns are typeset once, unlike X columns that tabularx typesets again until the widths fit, and
+    # longtable can break between rows instead of building the whole table as one box
+    # The columns share the line width with the padding on both sides of each column and the columns + 1 rules
+    width = f"\\dimexpr\\linewidth/{columns}-2\\tabcolsep-\\arrayrulewidth*{columns + 1}/{columns}\\relax"
+    return LongTable(table_spec=NoEscape(f"|{'|'.join([f'p{{{width}}}'] * columns)}|"), row_height="1.4")
+
+
+def generate_deliverables(schema: PLDRecord, locale: LocaleDictionary, document: Document,
+                          breakable: bool = False) -> Document:
+    # A minipage keeps the whole map on one page, which breakable tables cannot be part of
+    with document.create(MiniPage() if not breakable else Fragment()) as minipage:
+        minipage: Container
         with minipage.create(Section(title=locale.deliverable_map)) as section:
             section: Section
 
@@ -222,10 +226,11 @@ def generate_deliverables(schema: PLDSchema, locale: LocaleDictionary, document:
                     subsection: Subsection
                     subsets_length = len(deliverable.subsets)
                     tabular_length = subsets_length if subsets_length != 0 else 1
-                    table_spec = f"|{'|'.join(['X'] * tabular_length)}|"
-                    with subsection.create(Tabularx(table_spec=table_spec, row_height="1.4")) as tabularx:
-                        tabularx: Tabularx
+                    with subsection.create(generate_table(tabular_length, breakable)) as tabularx:
+                        tabularx: Tabular
                         tabularx.add_row([MultiColumn(tabular_length, data=deliverable.name, color="gray")])
+                        if breakable:
+                            tabularx.end_table_header()
 
                         tabularx_contents: List[List[str]] = [[f"{subset_index} {subset.name}"] + [
                             f"{subset_index}.{user_story_index} {user_story.name}" for user_story_index, user_story in
@@ -239,9 +244,10 @@ def generate_deliverables(schema: PLDSchema, locale: LocaleDictionary, document:
     return document
 
 
-def generate_user_story(user_story: UserStory, locale: LocaleDictionary, paragraph: Paragraph) -> Paragraph:
-    with paragraph.create(Tabularx(table_spec="|X|X|", row_height="1.4")) as tabularx:
-        tabularx: Tabularx
+def generate_user_story(user_story: UserStoryRecord, locale: LocaleDictionary, paragraph: Paragraph,
+                        breakable: bool = False) -> Paragraph:
+    with paragraph.create(generate_table(2, breakable)) as tabularx:
+        tabularx: Tabular
 
         definitions_of_done = Itemize()
         for definition_of_done in user_story.definitions_of_done:
@@ -251,6 +257,8 @@ def generate_user_story(user_story: UserStory, locale: LocaleDictionary, paragra
             comments.add_item(comment)
 
         tabularx.add_row([MultiColumn(2, data=bold(user_story.name), color="gray")])
+        if breakable:
+            tabularx.end_table_header()
         tabularx.add_row([f"{locale.as_user}: ", f"{locale.user_want}: "])
         tabularx.add_row([user_story.user, user_story.action])
         if user_story.description is not None:
@@ -276,51 +284,246 @@ def generate_user_story(user_story: UserStory, locale: LocaleDictionary, paragra
     return paragraph
 
 
-def generate_user_stories(schema: PLDSchema, locale: LocaleDictionary, document: Document) -> Document:
+def iterate_deliverable_user_stories(deliverable: DeliverableRecord, locale: LocaleDictionary,
+                                     breakable: bool = False) -> Iterator[LatexObject]:
+    # Sectioning commands are not environments, so headings are yielded as siblings of their contents and each user
+    # story can be serialized and released before the next one is built
+    yield Subsection(title=deliverable.name)
+    if deliverable.description is not None:
+        yield MediumText(data=deliverable.description)
+    for subset in deliverable.subsets:
+        yield Subsubsection(title=subset.name)
+        if subset.description is not None:
+            yield MediumText(data=subset.description)
+        for user_story in subset.user_stories:
+            paragraph = Paragraph(title=user_story.name)
+            paragraph.append(Command("mbox", ""))
+            paragraph.append(NoEscape("\\\\\n"))
+            yield generate_user_story(user_story, locale, paragraph, breakable)
+
+
+def generate_deliverable_user_stories(deliverable: DeliverableRecord, locale: LocaleDictionary,
+                                      document: Document, breakable: bool = False) -> Document:
+    for item in iterate_deliverable_user_stories(deliverable, locale, breakable):
+        document.append(item)
+    return document
+
+
+def generate_user_stories(schema: PLDRecord, locale: LocaleDictionary, document: Document,
+                          breakable: bool = False) -> Document:
     document.append(NewPage())
     with document.create(Section(title=locale.user_stories)) as section:
         section: Section
 
         for deliverable in schema.deliverables:
-            with section.create(Subsection(title=deliverable.name)) as subsection:
-                subsection: Subsection
-                if deliverable.description is not None:
-                    subsection.append(MediumText(data=deliverable.description))
-                for subset in deliverable.subsets:
-                    with subsection.create(Subsubsection(title=subset.name)) as subsubsection:
-                        subsubsection: Subsubsection
-                        if subset.description is not None:
-                            subsubsection.append(MediumText(data=subset.description))
-                        for user_story in subset.user_stories:
-                            with subsubsection.create(Paragraph(title=user_story.name)) as paragraph:
-                                paragraph: Paragraph
-                                paragraph.append(Command("mbox", ""))
-                                paragraph.append(NoEscape("\\\\\n"))
-                                generate_user_story(user_story, locale, paragraph)
+            generate_deliverable_user_stories(deliverable, locale, section, breakable)
     return document
 
 
-def get_unix_timestamp_from_version(version: Version) -> float:
-    return datetime.datetime.timestamp(datetime.datetime(version.date.year, version.date.month, version.date.day))
+def get_fragment_key(*values: Any) -> str:
+    digest = md5()
+    digest.update(GENERATOR_VERSION.encode())
+    digest.update(get_generator_digest().encode())
+    for value in values:
+        digest.update(json.dumps(value, sort_keys=True, default=pydantic_encoder).encode())
+    return digest.hexdigest()
+
+
+def generate_fragment(name: str, key: str, fragments_dirpath: str, document: Document,
+                      generate: Callable[[], Iterable[LatexObject]]) -> str:
+    filename = f"{name}-{key}.tex"
+    filepath = os.path.join(fragments_dirpath, filename)
+    if not os.path.isfile(filepath):
+        with profile(f"generate_fragment {name}"), open(f"{filepath}.tmp", "w") as file:
+            for item in generate():
+                file.write(item.dumps())
+                file.write(Fragment.content_separator)
+        os.replace(f"{filepath}.tmp", filepath)
+    document.append(Command("input", NoEscape(f"{FRAGMENTS_DIRNAME}/{filename}")))
+    return filename
+
+
+def prepare_fragments_dir(build_dir: str, document: Document) -> str:
+    fragments_dirpath = os.path.join(build_dir, FRAGMENTS_DIRNAME)
+    os.makedirs(fragments_dirpath, exist_ok=True)
+    for name in FRAGMENT_PACKAGES:
+        document.packages.append(Package(name))
+    return fragments_dirpath
+
+
+def remove_stale_fragments(fragments_dirpath: str, filenames: List[str]) -> None:
+    for filename in os.listdir(fragments_dirpath):
+        if filename not in filenames:
+            os.remove(os.path.join(fragments_dirpath, filename))
+
+
+def generate_front_fragments(schema: PLDRecord, locale: LocaleDictionary, document: Document,
+                             fragments_dirpath: str, author_stats: AuthorStats,
+                             generate_contents: Callable[[LocaleDictionary, Document], Document],
+                             organigram_filename: Optional[str] = None, breakable: bool = False) -> List[str]:
+    filenames: List[str] = [
+        generate_fragment("document-description",
+                          get_fragment_key(locale, schema.title, schema.description, schema.authors,
+                                           schema.versions[-1], author_stats.total_man_days,
+                                           author_stats.man_days),
+                          fragments_dirpath, document,
+                          lambda: [generate_document_description(schema, locale, Fragment(), author_stats)]),
+        generate_fragment("document-versions-table", get_fragment_key(locale, schema.versions),
+                          fragments_dirpath, document,
+                          lambda: [generate_document_versions_table(schema, locale, Fragment())])
+    ]
+    generate_contents(locale, document)
+    filenames += [
+        generate_fragment("organigram",
+                          get_fragment_key(locale, schema.title,
+                                           [deliverable.name for deliverable in schema.deliverables],
+                                           organigram_filename),
+                          fragments_dirpath, document,
+                          lambda: [generate_organigram(schema, locale, Fragment(), organigram_filename)]),
+        generate_fragment("deliverables",
+                          get_fragment_key(locale, [[deliverable.name] + [
+                              [subset.name] + [user_story.name for user_story in subset.user_stories]
+                              for subset in deliverable.subsets] for deliverable in schema.deliverables], breakable),
+                          fragments_dirpath, document,
+                          lambda: [generate_deliverables(schema, locale, Fragment(), breakable)])
+    ]
+    return filenames
+
+
+def generate_user_stories_fragment(deliverable: DeliverableRecord, n_deliverable: int, locale: LocaleDictionary,
+                                   document: Document, fragments_dirpath: str, breakable: bool = False) -> str:
+    return generate_fragment(f"user-stories-{n_deliverable}", get_fragment_key(locale, deliverable, breakable),
+                             fragments_dirpath, document,
+                             lambda: iterate_deliverable_user_stories(deliverable, locale, breakable))
+
+
+def generate_work_report_fragment(schema: PLDRecord, locale: LocaleDictionary, document: Document,
+                                  fragments_dirpath: str, author_stats: AuthorStats) -> str:
+    user_stories = [user_story for deliverable in schema.deliverables for subset in deliverable.subsets
+                    for user_story in subset.user_stories]
+    return generate_fragment(
+        "work-report",
+        get_fragment_key(locale, schema.authors, [(user_story.name, user_story.status, user_story.assignments)
+                                                  for user_story in user_stories]),
+        fragments_dirpath, document,
+        lambda: [generate_work_report_page(schema, locale, Fragment(), author_stats)])
+
+
+def generate_section_fragments(schema: PLDRecord, locale: LocaleDictionary, document: Document,
+                               build_dir: str, author_stats: AuthorStats,
+                               organigram_filename: Optional[str] = None, breakable: bool = False) -> Document:
+    fragments_dirpath = prepare_fragments_dir(build_dir, document)
+    filenames = generate_front_fragments(schema, locale, document, fragments_dirpath, author_stats, generate_toc,
+                                         organigram_filename, breakable)
+    document.append(NewPage())
+    document.append(Section(title=locale.user_stories))
+    for n_deliverable, deliverable in enumerate(schema.deliverables, start=1):
+        filenames.append(generate_user_stories_fragment(deliverable, n_deliverable, locale, document,
+                                                        fragments_dirpath, breakable))
+    filenames.append(generate_work_report_fragment(schema, locale, document, fragments_dirpath, author_stats))
+    remove_stale_fragments(fragments_dirpath, filenames)
+    return document
 
 
-def generate_pld(schema: PLDSchema, locale: LocaleDictionary) -> Document:
+def generate_document(schema: PLDRecord, locale: LocaleDictionary,
+                      last_page: str = "\\pageref{LastPage}") -> Document:
     document = Document(f"PLD {datetime.date.today().year} - {schema.title}",
                         geometry_options={"left": "20mm", "top": "20mm"},
                         documentclass=Command("documentclass", arguments=["extarticle"],
                                               options=["a4paper", "12pt", "table"]),
                         fontenc="T1", inputenc="utf8", page_numbers=True)
-    schema.versions = sorted(schema.versions, key=get_unix_timestamp_from_version)
-    generate_dependencies(document)
-    generate_options(document)
-    generate_style(schema, locale, document)
-
-    generate_first_page(schema, document)
-    generate_document_description(schema, locale, document)
-    generate_document_versions_table(schema, locale, document)
-    generate_toc(locale, document)
-    generate_organigram(schema, locale, document)
-    generate_deliverables(schema, locale, document)
-    generate_user_stories(schema, locale, document)
-    generate_work_report_page(schema, locale, document)
+    with profile("generate_dependencies"):
+        generate_dependencies(document)
+    document.preamble.append(NoEscape(PREAMBLE_DUMP_MARKER))
+    with profile("generate_options"):
+        generate_options(document)
+    with profile("generate_style"):
+        generate_style(schema, locale, document, last_page)
+    return document
+
+
+def generate_split_unit(schema: PLDRecord, locale: LocaleDictionary, name: str) -> Document:
+    document = generate_document(schema, locale, SPLIT_LAST_PAGE_COMMAND)
+    document.preamble.append(UnsafeCommand("providecommand", Command("pldlastpage"), extra_arguments="?"))
+    document.append(NoEscape(f"\\InputIfFileExists{{{name}.pages}}{{}}{{}}"))
+    return document
+
+
+def generate_pld_units(schema: PLDRecord, locale: LocaleDictionary, build_dir: str,
+                       organigram_filename: Optional[str] = None, breakable: bool = False,
+                       author_stats: Optional[AuthorStats] = None) -> List[Tuple[str, Document]]:
+    if author_stats is None:
+        with profile("generate_stats"):
+            author_stats = aggregate_authors(schema)
+
+    front = generate_split_unit(schema, locale, "pld-front")
+    fragments_dirpath = prepare_fragments_dir(build_dir, front)
+    generate_first_page(schema, front)
+    filenames = generate_front_fragments(schema, locale, front, fragments_dirpath, author_stats, generate_merged_toc,
+                                         organigram_filename, breakable)
+    units: List[Tuple[str, Document]] = [("pld-front", front)]
+
+    for n_deliverable, deliverable in enumerate(schema.deliverables, start=1):
+        name = f"pld-deliverable-{n_deliverable}"
+        unit = generate_split_unit(schema, locale, name)
+        prepare_fragments_dir(build_dir, unit)
+        unit.append(Command("setcounter", "secnumdepth", extra_arguments="50"))
+        unit.append(Command("setcounter", "tocdepth", extra_arguments="50"))
+        if n_deliverable == 1:
+            unit.append(Command("setcounter", "section", extra_arguments=str(SPLIT_FRONT_NUMBERED_SECTIONS)))
+            unit.append(Section(title=locale.user_stories))
+        else:
+            unit.append(Command("setcounter", "section", extra_arguments=str(SPLIT_FRONT_NUMBERED_SECTIONS + 1)))
+            unit.append(Command("setcounter", "subsection", extra_arguments=str(n_deliverable - 1)))
+        filenames.append(generate_user_stories_fragment(deliverable, n_deliverable, locale, unit, fragments_dirpath,
+                                                        breakable))
+        units.append((name, unit))
+
+    back = generate_split_unit(schema, locale, "pld-back")
+    prepare_fragments_dir(build_dir, back)
+    filenames.append(generate_work_report_fragment(schema, locale, back, fragments_dirpath, author_stats))
+    units.append(("pld-back", back))
+
+    remove_stale_fragments(fragments_dirpath, filenames)
+    return units
+
+
+def generate_merged_pld(unit_names: List[str]) -> Document:
+    # Pages keep the A4 size of the units rather than being scaled onto the default letter paper
+    document = Document(documentclass=Command("documentclass", arguments=["article"], options=["a4paper"]),
+                        fontenc=None, inputenc=None, lmodern=False, textcomp=False, page_numbers=False)
+    document.packages.append(Package("pdfpages"))
+    for name in unit_names:
+        document.append(Command("includepdf", f"{name}.pdf", options="pages=-,fitpaper"))
+    return document
+
+
+def generate_pld(schema: PLDRecord, locale: LocaleDictionary, build_dir: Optional[str] = None,
+                 organigram_filename: Optional[str] = None, breakable: bool = False,
+                 author_stats: Optional[AuthorStats] = None) -> Document:
+    document = generate_document(schema, locale)
+
+    if author_stats is None:
+        with profile("generate_stats"):
+            author_stats = aggregate_authors(schema)
+
+    with profile("generate_first_page"):
+        generate_first_page(schema, document)
+    if build_dir is not None:
+        return generate_section_fragments(schema, locale, document, build_dir, author_stats, organigram_filename,
+                                          breakable)
+    with profile("generate_document_description"):
+        generate_document_description(schema, locale, document, author_stats)
+    with profile("generate_document_versions_table"):
+        generate_document_versions_table(schema, locale, document)
+    with profile("generate_toc"):
+        generate_toc(locale, document)
+    with profile("generate_organigram"):
+        generate_organigram(schema, locale, document, organigram_filename)
+    with profile("generate_deliverables"):
+        generate_deliverables(schema, locale, document, breakable)
+    with profile("generate_user_stories"):
+        generate_user_stories(schema, locale, document, breakable)
+    with profile("generate_work_report_page"):
+        generate_work_report_page(schema, locale, document, author_stats)
     return document
@@ -0,0 +1,14 @@
+import glob
+import os
+from typing import List
+
+
+def collect_schema_filepaths(inputs: List[str]) -> List[str]:
+    schema_filepaths: List[str] = []
+    for path in inputs:
+        if os.path.isdir(path):
+            schema_filepaths += sorted(glob.glob(os.path.join(path, "*.json")))
+        else:
+            schema_filepaths.append(path)
+    # Keep the first occurrence of each file so it is rendered only once
+    return list(dict.fromkeys(schema_filepaths))
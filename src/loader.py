@@ -0,0 +1,183 @@
+import json
+import os
+import uuid
+from hashlib import md5
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar, Union
+
+from pydantic import BaseModel, VERSION as PYDANTIC_VERSION
+from pydantic.datetime_parse import parse_date
+
+from src.cache import GENERATOR_VERSION, get_cache_dir, get_source_digest
+from src.model import PLDRecord, to_record
+from src.profiling import profile
+from src.schema import PLDSchema, LocaleDictionary, Locale, Version, Status, UserStory, Subset, Deliverable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+Model = TypeVar("Model", bound=BaseModel)
+# Each validated file is a full normalized copy of a PLD, only the most recently used ones are kept
+MAX_VALIDATED_SCHEMAS = 32
+
+
+def parse_json(content: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def parse_optional_date(value: Any) -> Any:
+    return None if value is None else parse_date(value)
+
+
+def parse_locale(value: Any) -> Any:
+    try:
+        return Locale(value)
+    except ValueError:
+        return value
+
+
+def construct_model(model: Type[Model], values: Dict[str, Any], converters: Dict[str, Callable[[Any], Any]]) -> Model:
+    # Parses back the values the JSON output of validated models holds as strings, without checking any constraint
+    return model.construct(**{name: converters[name](value) if name in converters else value
+                              for name, value in values.items() if name in model.__fields__})
+
+
+def construct_user_story(values: Dict[str, Any]) -> UserStory:
+    return construct_model(UserStory, values, {"estimated_duration": float, "due_date": parse_optional_date,
+                                               "end_date": parse_optional_date, "status": Status})
+
+
+def construct_subset(values: Dict[str, Any]) -> Subset:
+    return construct_model(Subset, values, {
+        "user_stories": lambda user_stories: [construct_user_story(user_story) for user_story in user_stories]})
+
+
+def construct_deliverable(values: Dict[str, Any]) -> Deliverable:
+    return construct_model(Deliverable, values, {
+        "subsets": lambda subsets: [construct_subset(subset) for subset in subsets]})
+
+
+def construct_schema(values: Dict[str, Any]) -> PLDSchema:
+    return construct_model(PLDSchema, values, {
+        "locale": parse_locale,
+        "versions": lambda versions: [construct_model(Version, version, {"date": parse_date}) for version in versions],
+        "deliverables": lambda deliverables: [construct_deliverable(deliverable) for deliverable in deliverables]})
+
+
+def get_validated_filepath(content: bytes) -> str:
+    digest = md5()
+    digest.update(GENERATOR_VERSION.encode())
+    # Validation rules live in the schema and in pydantic, a change to either must validate every file again
+    digest.update(get_source_digest("schema.py").encode())
+    digest.update(str(PYDANTIC_VERSION).encode())
+    digest.update(content)
+    return os.path.join(get_cache_dir("validated"), f"{digest.hexdigest()}.json")
+
+
+def read_validated_schema(validated_filepath: str) -> Optional[bytes]:
+    try:
+        with open(validated_filepath, "rb") as file:
+            content = file.read()
+        # Reading an entry marks it as recently used
+        os.utime(validated_filepath)
+    except FileNotFoundError:
+        return None
+    return content
+
+
+def evict_validated_schemas(cache_dir: str) -> None:
+    modification_times: Dict[str, float] = dict()
+    for filename in os.listdir(cache_dir):
+        try:
+            modification_times[filename] = os.stat(os.path.join(cache_dir, filename)).st_mtime
+        except FileNotFoundError:
+            pass
+    validated_filenames = sorted((filename for filename in modification_times if filename.endswith(".json")),
+                                 key=lambda filename: modification_times[filename], reverse=True)
+    for filename in validated_filenames[MAX_VALIDATED_SCHEMAS:]:
+        try:
+            os.remove(os.path.join(cache_dir, filename))
+        except FileNotFoundError:
+            pass
+
+
+def write_validated_schema(schema: PLDSchema, validated_filepath: str) -> None:
+    temporary_filepath = f"{validated_filepath}.{uuid.uuid4().hex}"
+    with open(temporary_filepath, "w") as file:
+        file.write(schema.json())
+    os.replace(temporary_filepath, validated_filepath)
+    evict_validated_schemas(os.path.dirname(validated_filepath))
+
+
+def load_schema(schema_filepath: str, trusted: bool = True) -> PLDSchema:
+    with open(schema_filepath, "rb") as file:
+        content = file.read()
+    validated_filepath: Optional[str] = get_validated_filepath(content) if trusted else None
+    validated_content = read_validated_schema(validated_filepath) if validated_filepath is not None else None
+    if validated_content is not None:
+        # The validated output is already coerced and normalized, building the models from it needs no checks
+        with profile("schema_args"):
+            schema_args = parse_json(validated_content)
+        with profile("construction"):
+            return construct_schema(schema_args)
+    with profile("schema_args"):
+        schema_args = parse_json(content)
+    if not isinstance(schema_args, dict):
+        raise ValueError(f"Expected a JSON object in {schema_filepath}")
+    with profile("validation"):
+        schema = PLDSchema(**schema_args)
+    if validated_filepath is not None:
+        write_validated_schema(schema, validated_filepath)
+    return schema
+
+
+def load_schema_incrementally(schema_filepath: str,
+                              deliverables: Dict[str, Deliverable]) -> Tuple[PLDSchema, Dict[str, Deliverable]]:
+    # Deliverables whose JSON is unchanged since the previous load reuse their validated models, so an edit only
+    # validates the deliverables it touched
+    with profile("schema_args"):
+        with open(schema_filepath, "rb") as file:
+            schema_args = parse_json(file.read())
+    if not isinstance(schema_args, dict):
+        raise ValueError(f"Expected a JSON object in {schema_filepath}")
+    deliverables_args = schema_args.get("deliverables", [])
+    if not isinstance(deliverables_args, list) or not all(isinstance(args, dict) for args in deliverables_args):
+        # Validating everything reports the malformed deliverables with their position
+        with profile("validation"):
+            return PLDSchema(**schema_args), dict()
+    keys = [json.dumps(args, sort_keys=True) for args in deliverables_args]
+    with profile("validation"):
+        schema = PLDSchema(**dict(schema_args, deliverables=[]))
+        validated_deliverables = {key: deliverables[key] if key in deliverables else Deliverable(**args)
+                                  for key, args in zip(keys, deliverables_args)}
+    schema.deliverables = [validated_deliverables[key] for key in keys]
+    return schema, validated_deliverables
+
+
+def load_locale_name(locale_name: str) -> LocaleDictionary:
+    with open(str(Path(__file__).parent.joinpath("locale", f"{locale_name}.json")), "rb") as file:
+        locale_args = parse_json(file.read())
+    return LocaleDictionary(**locale_args)
+
+
+def load_record(schema_filepath: str, trusted: bool = True) -> PLDRecord:
+    schema = load_schema(schema_filepath, trusted)
+    # The validated models are released once converted, only the compact records are kept while rendering
+    with profile("to_record"):
+        return to_record(schema)
+
+
+def load_locale(schema: Union[PLDSchema, PLDRecord]) -> LocaleDictionary:
+    return load_locale_name(schema.locale.value if hasattr(schema.locale, "value") else schema.locale)
+
+
+def validate_schema_file(schema_filepath: str, trusted: bool = True) -> Optional[str]:
+    try:
+        load_locale(load_schema(schema_filepath, trusted))
+    except (OSError, ValueError) as error:
+        return str(error)
+    return None
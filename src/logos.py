@@ -0,0 +1,56 @@
+import os
+import shutil
+import subprocess
+import uuid
+from hashlib import md5
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.cache import LOGO_FILENAMES, get_cache_dir
+
+LOGO_SOURCE_FILENAMES: Dict[str, List[str]] = {
+    "primary_logo.pdf": ["primary_logo.pdf", "primary_logo.svg", "logo.svg"],
+    "secondary_logo.pdf": ["secondary_logo.pdf", "secondary_logo.svg", "sublogo.svg"],
+}
+
+
+def find_logo_source(logo_filename: str, directories: List[str]) -> Optional[str]:
+    for directory in directories:
+        for source_filename in LOGO_SOURCE_FILENAMES[logo_filename]:
+            source_filepath = Path(directory).joinpath(source_filename)
+            if source_filepath.is_file():
+                return str(source_filepath)
+    return None
+
+
+def convert_logo(source_filepath: str, cache_dir: str) -> str:
+    with open(source_filepath, "rb") as file:
+        key = md5(file.read()).hexdigest()
+    logo_filepath = os.path.join(cache_dir, f"{key}.pdf")
+    if os.path.isfile(logo_filepath):
+        return logo_filepath
+    # Locales rendered on several threads may convert the same logo at once, each under its own name
+    temporary_filepath = os.path.join(cache_dir, f"{key}.{uuid.uuid4().hex}.pdf")
+    if Path(source_filepath).suffix == ".svg":
+        subprocess.run(["inkscape", "--export-type=pdf", "--export-area-drawing",
+                        f"--export-filename={temporary_filepath}", source_filepath],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    else:
+        shutil.copyfile(source_filepath, temporary_filepath)
+    os.replace(temporary_filepath, logo_filepath)
+    return logo_filepath
+
+
+def prepare_logos(schema_filepath: str, assets_dir: str, build_dir: str) -> List[Optional[str]]:
+    cache_dir = get_cache_dir("logos")
+    logo_filepaths: List[Optional[str]] = []
+    for logo_filename in LOGO_FILENAMES:
+        # Logos next to the schema file take precedence over the shared assets
+        source_filepath = find_logo_source(logo_filename, [str(Path(schema_filepath).parent), assets_dir])
+        if source_filepath is None:
+            logo_filepaths.append(None)
+            continue
+        logo_filepath = convert_logo(source_filepath, cache_dir)
+        shutil.copyfile(logo_filepath, os.path.join(build_dir, logo_filename))
+        logo_filepaths.append(logo_filepath)
+    return logo_filepaths
@@ -0,0 +1,88 @@
+import datetime
+import sys
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from src.schema import PLDSchema, Locale, Version, Status, UserStory, Subset, Deliverable
+
+
+class VersionRecord(NamedTuple):
+    version: str
+    date: datetime.date
+    authors: Tuple[str, ...]
+    sections: str
+    comment: str
+
+
+class UserStoryRecord(NamedTuple):
+    name: str
+    user: str
+    action: str
+    description: Optional[str]
+    definitions_of_done: Tuple[str, ...]
+    estimated_duration: float
+    due_date: Optional[datetime.date]
+    end_date: Optional[datetime.date]
+    status: Status
+    assignments: Tuple[str, ...]
+    comments: Tuple[str, ...]
+
+
+class SubsetRecord(NamedTuple):
+    name: str
+    description: Optional[str]
+    user_stories: Tuple[UserStoryRecord, ...]
+
+
+class DeliverableRecord(NamedTuple):
+    name: str
+    description: Optional[str]
+    subsets: Tuple[SubsetRecord, ...]
+
+
+class PLDRecord(NamedTuple):
+    locale: Union[Locale, str]
+    title: str
+    subtitle: Optional[str]
+    description: Optional[str]
+    authors: Tuple[str, ...]
+    versions: Tuple[VersionRecord, ...]
+    deliverables: Tuple[DeliverableRecord, ...]
+
+
+def intern_all(values: List[str]) -> Tuple[str, ...]:
+    # Names repeat across thousands of user stories, interning keeps a single copy of each
+    return tuple(sys.intern(value) for value in values)
+
+
+def normalize_comments(comments: Optional[Union[List[str], str]]) -> Tuple[str, ...]:
+    if comments is None:
+        return ()
+    return (comments,) if isinstance(comments, str) else tuple(comments)
+
+
+def to_version_record(version: Version) -> VersionRecord:
+    return VersionRecord(version.version, version.date, intern_all(version.authors), version.sections, version.comment)
+
+
+def to_user_story_record(user_story: UserStory) -> UserStoryRecord:
+    return UserStoryRecord(user_story.name, sys.intern(user_story.user), user_story.action, user_story.description,
+                           tuple(user_story.definitions_of_done), float(user_story.estimated_duration),
+                           user_story.due_date, user_story.end_date, Status(user_story.status),
+                           intern_all(user_story.assignments), normalize_comments(user_story.comments))
+
+
+def to_subset_record(subset: Subset) -> SubsetRecord:
+    return SubsetRecord(subset.name, subset.description,
+                        tuple(to_user_story_record(user_story) for user_story in subset.user_stories))
+
+
+def to_deliverable_record(deliverable: Deliverable) -> DeliverableRecord:
+    return DeliverableRecord(deliverable.name, deliverable.description,
+                             tuple(to_subset_record(subset) for subset in deliverable.subsets))
+
+
+def to_record(schema: PLDSchema) -> PLDRecord:
+    # Versions are sorted once here since records cannot be reordered later
+    versions = sorted((to_version_record(version) for version in schema.versions), key=lambda version: version.date)
+    return PLDRecord(schema.locale, schema.title, schema.subtitle, schema.description, intern_all(schema.authors),
+                     tuple(versions), tuple(to_deliverable_record(deliverable) for deliverable in schema.deliverables))
@@ -0,0 +1,190 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from hashlib import md5
+from typing import List, NamedTuple, Optional, Tuple
+
+from pylatex import Document, Command, Package, TikZ, TikZOptions, TikZNode, TikZDraw, TikZPathList, TikZCoordinate
+from pylatex.utils import NoEscape
+
+from src.cache import GENERATOR_VERSION, get_cache_dir, get_source_digest
+from src.compiler import run_pdflatex
+from src.profiling import profile
+
+ORGANIGRAM_FILENAME = "organigram.pdf"
+# Lengths are in centimeters, rows are packed within the text width of an A4 page with 20mm margins and the whole
+# organigram is scaled down to fit within 80% of its text height
+MAX_WIDTH = 16.0
+MAX_HEIGHT = 20.0
+CHARACTER_WIDTH = 0.22
+LINE_HEIGHT = 0.5
+BOX_MAX_TEXT_WIDTH = 4.4
+BOX_INNER_SEP = 0.2
+HORIZONTAL_GAP = 0.5
+VERTICAL_GAP = 1.0
+
+
+class OrganigramBox(NamedTuple):
+    handle: str
+    text: str
+    x: float
+    y: float
+    text_width: float
+    height: float
+
+    @property
+    def width(self) -> float:
+        return self.text_width + 2 * BOX_INNER_SEP
+
+    @property
+    def top(self) -> float:
+        return self.y + self.height / 2
+
+    @property
+    def bottom(self) -> float:
+        return self.y - self.height / 2
+
+
+class OrganigramLayout(NamedTuple):
+    project: OrganigramBox
+    rows: List[List[OrganigramBox]]
+
+
+def count_lines(text: str, max_characters: int) -> int:
+    lines, length = 1, 0
+    for word in text.split():
+        if length > 0 and length + 1 + len(word) > max_characters:
+            lines, length = lines + 1, len(word)
+        else:
+            length += len(word) + (1 if length > 0 else 0)
+    return lines
+
+
+def measure_text(text: str, max_text_width: float = BOX_MAX_TEXT_WIDTH) -> Tuple[float, float]:
+    text_width = min(max(len(text), 1) * CHARACTER_WIDTH, max_text_width)
+    lines = count_lines(text, int(max_text_width / CHARACTER_WIDTH))
+    return text_width, lines * LINE_HEIGHT + 2 * BOX_INNER_SEP
+
+
+def pack_rows(widths: List[float], max_width: float = MAX_WIDTH) -> List[List[int]]:
+    rows: List[List[int]] = []
+    row_width = 0.0
+    for index, width in enumerate(widths):
+        if len(rows) == 0 or row_width + HORIZONTAL_GAP + width > max_width:
+            rows.append([index])
+            row_width = width
+        else:
+            rows[-1].append(index)
+            row_width += HORIZONTAL_GAP + width
+    return rows
+
+
+def layout_organigram(title: str, names: List[str]) -> OrganigramLayout:
+    text_width, height = measure_text(title, MAX_WIDTH - 2 * BOX_INNER_SEP)
+    project = OrganigramBox("project-box", title, 0.0, -height / 2, text_width, height)
+    texts = [f"{n_deliverable}. {name}" for n_deliverable, name in enumerate(names, start=1)]
+    measures = [measure_text(text) for text in texts]
+    rows: List[List[OrganigramBox]] = []
+    top = project.bottom - VERTICAL_GAP
+    for indexes in pack_rows([text_width + 2 * BOX_INNER_SEP for text_width, _ in measures]):
+        # Boxes of a row share the height of the tallest one and the row is centered under the project box
+        row_height = max(measures[index][1] for index in indexes)
+        x = -(sum(measures[index][0] + 2 * BOX_INNER_SEP for index in indexes)
+              + HORIZONTAL_GAP * (len(indexes) - 1)) / 2
+        row: List[OrganigramBox] = []
+        for index in indexes:
+            box_width = measures[index][0] + 2 * BOX_INNER_SEP
+            row.append(OrganigramBox(f"deliverable-box-{index + 1}", texts[index], x + box_width / 2,
+                                     top - row_height / 2, measures[index][0], row_height))
+            x += box_width + HORIZONTAL_GAP
+        rows.append(row)
+        top -= row_height + VERTICAL_GAP
+    return OrganigramLayout(project, rows)
+
+
+def get_layout_height(layout: OrganigramLayout) -> float:
+    bottom = min(box.bottom for box in layout.rows[-1]) if len(layout.rows) > 0 else layout.project.bottom
+    return layout.project.top - bottom
+
+
+def generate_box(box: OrganigramBox) -> TikZNode:
+    # noinspection PyTypeChecker
+    return TikZNode(text=box.text, handle=box.handle, at=TikZCoordinate(round(box.x, 3), round(box.y, 3)),
+                    options=TikZOptions('draw', 'rounded corners', 'align=center', f'inner sep={BOX_INNER_SEP}cm',
+                                        f'text width={round(box.text_width, 3)}cm',
+                                        f'minimum height={round(box.height, 3)}cm'))
+
+
+def generate_line(*points: Tuple[float, float]) -> TikZDraw:
+    path: List[object] = []
+    for x, y in points:
+        if len(path) > 0:
+            path.append("--")
+        path.append(TikZCoordinate(round(x, 3), round(y, 3)))
+    # noinspection PyTypeChecker
+    return TikZDraw(TikZPathList(*path))
+
+
+def generate_organigram_tikz(layout: OrganigramLayout) -> TikZ:
+    scale = MAX_HEIGHT / get_layout_height(layout)
+    tikz = TikZ(options=TikZOptions(f"scale={round(scale, 3)}", "transform shape") if scale < 1 else None)
+    tikz.append(generate_box(layout.project))
+    if len(layout.rows) == 0:
+        return tikz
+    buses = [row[0].top + VERTICAL_GAP / 2 for row in layout.rows]
+    # Rows below the first one hang from a trunk running left of every row
+    trunk = min(row[0].x - row[0].width / 2 for row in layout.rows) - HORIZONTAL_GAP / 2
+    tikz.append(generate_line((0.0, layout.project.bottom), (0.0, buses[0])))
+    if len(layout.rows) > 1:
+        tikz.append(generate_line((trunk, buses[0]), (trunk, buses[-1])))
+    for n_row, (row, bus) in enumerate(zip(layout.rows, buses)):
+        left = trunk if len(layout.rows) > 1 else min(row[0].x, 0.0)
+        right = max(row[-1].x, 0.0) if n_row == 0 else row[-1].x
+        tikz.append(generate_line((left, bus), (right, bus)))
+        for box in row:
+            tikz.append(generate_box(box))
+            tikz.append(generate_line((box.x, bus), (box.x, box.top)))
+    return tikz
+
+
+def generate_organigram_document(layout: OrganigramLayout) -> Document:
+    document = Document(documentclass=Command("documentclass", arguments=["standalone"], options=["12pt"]),
+                        fontenc="T1", inputenc="utf8", page_numbers=False)
+    document.packages.append(Package("tikz"))
+    document.preamble.append(
+        Command('renewcommand', NoEscape('\\familydefault'), extra_arguments=NoEscape('\\sfdefault')))
+    document.append(generate_organigram_tikz(layout))
+    return document
+
+
+def get_organigram_key(title: str, names: List[str]) -> str:
+    digest = md5()
+    digest.update(GENERATOR_VERSION.encode())
+    digest.update(get_source_digest("organigram.py").encode())
+    for value in [title] + names:
+        digest.update(value.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def build_organigram(title: str, names: List[str], cache_dir: str) -> str:
+    organigram_filepath = os.path.join(cache_dir, f"{get_organigram_key(title, names)}.pdf")
+    if os.path.isfile(organigram_filepath):
+        return organigram_filepath
+    with profile("build_organigram"), tempfile.TemporaryDirectory(dir=cache_dir) as temporary_dir:
+        filepath = os.path.join(temporary_dir, "organigram")
+        generate_organigram_document(layout_organigram(title, names)).generate_tex(filepath)
+        run_pdflatex(f"{filepath}.tex", None)
+        os.replace(f"{filepath}.pdf", organigram_filepath)
+    return organigram_filepath
+
+
+def prepare_organigram(title: str, names: List[str], build_dir: str) -> Optional[str]:
+    try:
+        organigram_filepath = build_organigram(title, names, get_cache_dir("organigrams"))
+    except (OSError, subprocess.CalledProcessError):
+        # The document then draws the organigram itself
+        return None
+    shutil.copyfile(organigram_filepath, os.path.join(build_dir, ORGANIGRAM_FILENAME))
+    return ORGANIGRAM_FILENAME
@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+Result = TypeVar("Result")
+
+
+class Span:
+    def __init__(self, name: str, start: float):
+        self.name = name
+        self.start = start
+        self.duration = 0.0
+        self.thread_id = threading.get_ident()
+        self.children: List["Span"] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "start": self.start, "duration": self.duration, "thread_id": self.thread_id,
+                "children": [child.to_dict() for child in self.children]}
+
+
+class Profiler:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.root = Span("pld", 0.0)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Span]:
+        span = Span(name, time.perf_counter() - self.origin)
+        # Threads running in a copy of the context open their phases under the phase that submitted them
+        parent = current_span.get() or self.root
+        with self._lock:
+            parent.children.append(span)
+        token = current_span.set(span)
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - self.origin - span.start
+            current_span.reset(token)
+
+    def finish(self) -> None:
+        self.root.duration = time.perf_counter() - self.origin
+
+    def to_trace_events(self) -> Dict[str, Any]:
+        # Chrome trace event format, readable by chrome://tracing, Perfetto and speedscope
+        events: List[Dict[str, Any]] = []
+        spans: List[Span] = [self.root]
+        while len(spans) > 0:
+            span = spans.pop()
+            events.append({"name": span.name, "ph": "X", "ts": span.start * 1e6, "dur": span.duration * 1e6,
+                           "pid": os.getpid(), "tid": span.thread_id})
+            spans += span.children
+        return {"traceEvents": sorted(events, key=lambda event: event["ts"]), "displayTimeUnit": "ms"}
+
+    def to_folded(self) -> str:
+        # Folded stacks with self time in microseconds, as consumed by flamegraph.pl and speedscope
+        lines: List[str] = []
+
+        def fold(span: Span, prefix: str) -> None:
+            stack = f"{prefix};{span.name}" if prefix else span.name
+            self_duration = span.duration - sum(child.duration for child in span.children)
+            lines.append(f"{stack} {max(int(self_duration * 1e6), 0)}")
+            for child in span.children:
+                fold(child, stack)
+
+        fold(self.root, "")
+        return "\n".join(lines) + "\n"
+
+    def save(self, filepath: str) -> None:
+        with open(filepath, "w") as file:
+            if filepath.endswith(".json"):
+                json.dump(self.to_trace_events(), file, indent=2)
+            else:
+                file.write(self.to_folded())
+
+
+current_profiler: ContextVar[Optional[Profiler]] = ContextVar("current_profiler", default=None)
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def profiling(profiler: Profiler) -> Iterator[Profiler]:
+    token = current_profiler.set(profiler)
+    span_token = current_span.set(profiler.root)
+    try:
+        yield profiler
+    finally:
+        profiler.finish()
+        current_span.reset(span_token)
+        current_profiler.reset(token)
+
+
+@contextmanager
+def profile(name: str) -> Iterator[Optional[Span]]:
+    profiler = current_profiler.get()
+    if profiler is None:
+        yield None
+        return
+    with profiler.phase(name) as span:
+        yield span
+
+
+def submit_in_context(executor: Executor, function: Callable[..., Result], *args: Any) -> "Future[Result]":
+    # Executor threads do not inherit context variables, each task runs in its own copy of the submitting context
+    return executor.submit(copy_context().run, function, *args)
@@ -0,0 +1,113 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+from pylatex.errors import CompilerError
+
+from src.cache import compute_render_hash, is_render_cached, write_render_hash, get_cache_dir
+from src.compiler import CompileResult, compile_pdf, submit_compile
+from src.generator import FRAGMENTS_DIRNAME, generate_pld, generate_pld_units
+from src.loader import load_record, load_locale, load_locale_name
+from src.logos import prepare_logos
+from src.organigram import prepare_organigram
+from src.profiling import profile, submit_in_context
+from src.model import PLDRecord
+from src.schema import LocaleDictionary
+from src.split import compile_split_pdf
+from src.stats import AuthorStats, aggregate_authors
+
+
+class RenderOptions(NamedTuple):
+    assets_dir: str = "assets"
+    force: bool = False
+    compile_address: Optional[str] = None
+    split: bool = False
+    trusted: bool = True
+    breakable: bool = False
+    locales: Tuple[str, ...] = ()
+
+
+def compile_tex(tex_filepath: str, compile_address: Optional[str] = None) -> CompileResult:
+    if compile_address is None:
+        return compile_pdf(tex_filepath, get_cache_dir("formats"))
+    result = submit_compile(compile_address, tex_filepath)
+    if result.error is not None:
+        raise CompilerError(result.error)
+    return result
+
+
+def write_tex(schema: PLDRecord, locale: LocaleDictionary, build_dir: str, split: bool = False,
+              breakable: bool = False, author_stats: Optional[AuthorStats] = None) -> List[str]:
+    with profile("prepare_organigram"):
+        organigram_filename = prepare_organigram(schema.title,
+                                                 [deliverable.name for deliverable in schema.deliverables], build_dir)
+    if split:
+        with profile("generate_pld"):
+            units = generate_pld_units(schema, locale, build_dir, organigram_filename, breakable, author_stats)
+        with profile("generate_tex"):
+            for name, unit in units:
+                unit.generate_tex(os.path.join(build_dir, name))
+        return [name for name, _ in units]
+    with profile("generate_pld"):
+        document = generate_pld(schema, locale, build_dir, organigram_filename, breakable, author_stats)
+    with profile("generate_tex"):
+        document.generate_tex(os.path.join(build_dir, "pld"))
+    return ["pld"]
+
+
+def compile_names(names: List[str], build_dir: str, compile_address: Optional[str] = None,
+                  split: bool = False) -> CompileResult:
+    if split:
+        return compile_split_pdf(names, build_dir, lambda tex_filepath: compile_tex(tex_filepath, compile_address))
+    return compile_tex(os.path.join(build_dir, f"{names[0]}.tex"), compile_address)
+
+
+def render_schema(schema: PLDRecord, locale: LocaleDictionary, schema_filepath: str, build_dir: str,
+                  options: RenderOptions, author_stats: Optional[AuthorStats] = None) -> Optional[CompileResult]:
+    filepath = os.path.join(build_dir, "pld")
+    os.makedirs(build_dir, exist_ok=True)
+    with profile("prepare_logos"):
+        logo_filepaths = prepare_logos(schema_filepath, options.assets_dir, build_dir)
+    with profile("compute_render_hash"):
+        render_hash = compute_render_hash(schema, locale, logo_filepaths, options.breakable, options.split)
+    if not options.force and is_render_cached(build_dir, f"{filepath}.pdf", render_hash):
+        return None
+    if options.force:
+        # Forcing a render regenerates every section as well, not only the document around them
+        shutil.rmtree(os.path.join(build_dir, FRAGMENTS_DIRNAME), ignore_errors=True)
+    names = write_tex(schema, locale, build_dir, options.split, options.breakable, author_stats)
+    with profile("compile"):
+        result = compile_names(names, build_dir, options.compile_address, options.split)
+    write_render_hash(build_dir, render_hash)
+    return result
+
+
+def render_pld(schema_filepath: str, build_dir: str = "build",
+               options: RenderOptions = RenderOptions()) -> Optional[CompileResult]:
+    schema = load_record(schema_filepath, options.trusted)
+    with profile("load_locale"):
+        locale = load_locale(schema)
+    return render_schema(schema, locale, schema_filepath, build_dir, options)
+
+
+def render_locale(schema: PLDRecord, locale_name: str, locale: LocaleDictionary, schema_filepath: str,
+                  build_dir: str, options: RenderOptions, author_stats: AuthorStats) -> Optional[CompileResult]:
+    with profile(f"render {locale_name}"):
+        return render_schema(schema, locale, schema_filepath, os.path.join(build_dir, locale_name), options,
+                             author_stats)
+
+
+def render_locales(schema_filepath: str, build_dir: str = "build",
+                   options: RenderOptions = RenderOptions()) -> List[Tuple[str, Optional[CompileResult]]]:
+    schema = load_record(schema_filepath, options.trusted)
+    with profile("load_locale"):
+        locales = [load_locale_name(locale_name) for locale_name in options.locales]
+    # Only the text differs between locales, the records and their stats are shared by all of them
+    with profile("generate_stats"):
+        author_stats = aggregate_authors(schema)
+    with ThreadPoolExecutor(max_workers=len(locales)) as executor:
+        futures = [submit_in_context(executor, render_locale, schema, locale_name, locale, schema_filepath, build_dir,
+                                     options, author_stats)
+                   for locale_name, locale in zip(options.locales, locales)]
+        return [(locale_name, future.result()) for locale_name, future in zip(options.locales, futures)]
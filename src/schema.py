@@ -61,13 +61,13 @@ class Status(str, Enum):
     abandoned = "Abandoned"
 
     def to_priority(self) -> int:
-        if self.name == Status.to_do:
+        if self == Status.to_do:
             return 2
-        elif self.name == Status.wip:
+        elif self == Status.wip:
             return 3
-        elif self.name == Status.done:
+        elif self == Status.done:
             return 4
-        elif self.name == Status.abandoned:
+        elif self == Status.abandoned:
             return 1
         else:
             return 0
@@ -120,6 +120,7 @@ class Deliverable(BaseModel):
 
 class Locale(str, Enum):
     french = "fr_FR"
+    english = "en_US"
 
 
 class PLDSchema(BaseModel):
@@ -0,0 +1,230 @@
+import base64
+import json
+import os
+import shutil
+import threading
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from hashlib import md5
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.batch import RenderResult, render_job
+from src.logos import LOGO_SOURCE_FILENAMES
+from src.render import RenderOptions
+
+SCHEMA_FILENAME = "pld_data.json"
+MAX_PENDING_JOBS = 64
+# Finished jobs are kept, with their directory, so their PDF can still be downloaded until this many newer ones finish
+MAX_FINISHED_JOBS = 256
+LOGO_UPLOAD_FILENAMES = [source_filename for source_filenames in LOGO_SOURCE_FILENAMES.values()
+                         for source_filename in source_filenames]
+
+
+class Job:
+    def __init__(self, job_id: str, directory: str):
+        self.id = job_id
+        self.directory = directory
+        self.result: Optional[RenderResult] = None
+        self.finished = threading.Event()
+
+    @property
+    def schema_filepath(self) -> str:
+        return os.path.join(self.directory, SCHEMA_FILENAME)
+
+    @property
+    def build_dir(self) -> str:
+        return os.path.join(self.directory, "build")
+
+    @property
+    def status(self) -> str:
+        if self.result is None:
+            return "pending"
+        return "failed" if self.result.error is not None else "done"
+
+    def finish(self, future: Future) -> None:
+        try:
+            self.result = future.result()
+        except Exception:
+            self.result = RenderResult(self.schema_filepath, self.build_dir, 0.0, False, 0, traceback.format_exc())
+        self.finished.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        description: Dict[str, Any] = {"id": self.id, "status": self.status, "pdf": f"/jobs/{self.id}/pdf"}
+        if self.result is not None:
+            description.update({"duration": self.result.duration, "passes": self.result.passes,
+                                "error": self.result.error})
+        return description
+
+
+def parse_job_request(content: bytes) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    body = json.loads(content)
+    if not isinstance(body, dict):
+        raise ValueError("Expected a JSON object")
+    # A bare PLD json file is accepted as well, its logos then come from the assets folder of the service
+    if "schema" not in body:
+        return body, dict()
+    if not isinstance(body["schema"], dict):
+        raise ValueError("Expected the schema to be a JSON object")
+    if not isinstance(body.get("logos", dict()), dict):
+        raise ValueError("Expected the logos to be a JSON object mapping file names to base64 strings")
+    logos: Dict[str, bytes] = dict()
+    for filename, data in body.get("logos", dict()).items():
+        if filename not in LOGO_UPLOAD_FILENAMES:
+            raise ValueError(f"Unknown logo {filename}, expected one of {', '.join(LOGO_UPLOAD_FILENAMES)}")
+        if not isinstance(data, str):
+            raise ValueError(f"Expected logo {filename} to be a base64 string")
+        logos[filename] = base64.b64decode(data, validate=True)
+    return body["schema"], logos
+
+
+def get_job_id(schema_args: Dict[str, Any], logos: Dict[str, bytes]) -> str:
+    digest = md5(json.dumps(schema_args, sort_keys=True).encode())
+    for filename in sorted(logos):
+        digest.update(filename.encode())
+        digest.update(md5(logos[filename]).digest())
+    return digest.hexdigest()
+
+
+def write_job_files(job: Job, schema_args: Dict[str, Any], logos: Dict[str, bytes]) -> None:
+    os.makedirs(job.directory, exist_ok=True)
+    with open(job.schema_filepath, "w") as file:
+        json.dump(schema_args, file)
+    for filename, data in logos.items():
+        with open(os.path.join(job.directory, filename), "wb") as file:
+            file.write(data)
+
+
+class RenderService:
+    def __init__(self, jobs_dir: str, options: RenderOptions, workers: Optional[int] = None):
+        self.jobs_dir = jobs_dir
+        self.options = options
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.jobs: Dict[str, Job] = dict()
+        self.lock = threading.Lock()
+
+    def submit(self, schema_args: Dict[str, Any], logos: Dict[str, bytes]) -> Optional[Job]:
+        job_id = get_job_id(schema_args, logos)
+        with self.lock:
+            job = self.jobs.get(job_id)
+            # Identical requests share the pending job, finished ones are rendered again since the PLD shows the
+            # current date, which is cheap when the build directory is still up to date
+            if job is not None and job.status == "pending":
+                return job
+            if sum(1 for job in self.jobs.values() if job.status == "pending") >= MAX_PENDING_JOBS:
+                return None
+            job = Job(job_id, os.path.join(self.jobs_dir, job_id))
+            write_job_files(job, schema_args, logos)
+            # Moved to the end, so the jobs stay ordered from the oldest submission to the latest one
+            self.jobs.pop(job_id, None)
+            self.jobs[job_id] = job
+            self.evict_finished_jobs()
+            future = self.submit_render(job)
+        future.add_done_callback(job.finish)
+        return job
+
+    def submit_render(self, job: Job) -> Future:
+        try:
+            return self.executor.submit(render_job, job.schema_filepath, job.build_dir, self.options, None)
+        except BrokenProcessPool:
+            # A worker died abruptly (killed, out of memory), the jobs it was running failed but later ones get a
+            # new pool
+            self.executor.shutdown(wait=False)
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self.executor.submit(render_job, job.schema_filepath, job.build_dir, self.options, None)
+
+    def evict_finished_jobs(self) -> None:
+        finished_jobs = [job for job in self.jobs.values() if job.status != "pending"]
+        for job in finished_jobs[:max(len(finished_jobs) - MAX_FINISHED_JOBS, 0)]:
+            del self.jobs[job.id]
+            shutil.rmtree(job.directory, ignore_errors=True)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+
+class RenderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: RenderService):
+        super().__init__(address, RenderRequestHandler)
+        self.service = service
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    server: RenderServer
+
+    def send_json(self, status: HTTPStatus, content: Dict[str, Any]) -> None:
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_pdf(self, job: Job) -> None:
+        pdf_filepath = os.path.join(job.build_dir, "pld.pdf")
+        with open(pdf_filepath, "rb") as file:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(os.fstat(file.fileno()).st_size))
+            self.send_header("Content-Disposition", "attachment; filename=\"pld.pdf\"")
+            self.end_headers()
+            shutil.copyfileobj(file, self.wfile)
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path.rstrip("/") != "/jobs":
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"No such endpoint {self.path}"})
+            return
+        try:
+            schema_args, logos = parse_job_request(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError as error:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(error)})
+            return
+        job = self.server.service.submit(schema_args, logos)
+        if job is None:
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Too many pending jobs, try again later"})
+            return
+        self.send_json(HTTPStatus.ACCEPTED, job.to_dict())
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        job = self.server.service.get(parts[1]) if len(parts) in [2, 3] and parts[0] == "jobs" else None
+        if job is None or (len(parts) == 3 and parts[2] != "pdf"):
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"No such job or endpoint {self.path}"})
+            return
+        if "wait" in parse_qs(url.query, keep_blank_values=True):
+            job.finished.wait()
+        if len(parts) == 2:
+            self.send_json(HTTPStatus.OK, job.to_dict())
+        elif job.status != "done":
+            self.send_json(HTTPStatus.CONFLICT, job.to_dict())
+        else:
+            self.send_pdf(job)
+
+
+def parse_http_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def serve_http(address: str, jobs_dir: str, options: RenderOptions, workers: Optional[int] = None) -> None:
+    service = RenderService(jobs_dir, options, workers)
+    server = RenderServer(parse_http_address(address), service)
+    print(f"Rendering PLD on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
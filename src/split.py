@@ -0,0 +1,104 @@
+import os
+import re
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from src.compiler import CompileResult, run_pdflatex
+from src.generator import SPLIT_CONTENTS_FILENAME, generate_merged_pld
+from src.profiling import profile, submit_in_context
+
+LAST_PAGE_PATTERN = re.compile(r"\\newlabel\{LastPage\}\{\{[^}]*\}\{(\d+)\}")
+FIRST_PAGE_PATTERN = re.compile(r"\\setcounter\{page\}\{(\d+)\}")
+TOC_ENTRY_PREFIX = "\\@writefile{toc}{"
+MAX_ITERATIONS = 4
+
+
+def read_first_page(pages_filepath: str) -> int:
+    try:
+        with open(pages_filepath, "r") as file:
+            match = FIRST_PAGE_PATTERN.search(file.read())
+    except FileNotFoundError:
+        return 1
+    return int(match.group(1)) if match is not None else 1
+
+
+def read_last_page(aux_filepath: str) -> int:
+    with open(aux_filepath, "r") as file:
+        match = LAST_PAGE_PATTERN.search(file.read())
+    if match is None:
+        raise ValueError(f"No LastPage label in {aux_filepath}")
+    return int(match.group(1))
+
+
+def read_toc_entries(aux_filepath: str) -> List[str]:
+    with open(aux_filepath, "r") as file:
+        return [line.rstrip()[len(TOC_ENTRY_PREFIX):-1] + "\n" for line in file
+                if line.startswith(TOC_ENTRY_PREFIX)]
+
+
+def write_if_changed(filepath: str, content: str) -> bool:
+    try:
+        with open(filepath, "r") as file:
+            if file.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(filepath, "w") as file:
+        file.write(content)
+    return True
+
+
+def update_page_numbers(unit_names: List[str], build_dir: str) -> bool:
+    first_pages: Dict[str, int] = dict()
+    page = 1
+    for name in unit_names:
+        unit_filepath = os.path.join(build_dir, name)
+        page_count = read_last_page(f"{unit_filepath}.aux") - read_first_page(f"{unit_filepath}.pages") + 1
+        first_pages[name] = page
+        page += page_count
+    changed = False
+    for name, first_page in first_pages.items():
+        changed |= write_if_changed(os.path.join(build_dir, f"{name}.pages"),
+                                    f"\\setcounter{{page}}{{{first_page}}}\\def\\pldlastpage{{{page - 1}}}\n")
+    return changed
+
+
+def update_contents(unit_names: List[str], build_dir: str) -> bool:
+    entries: List[str] = []
+    for name in unit_names:
+        entries += read_toc_entries(os.path.join(build_dir, f"{name}.aux"))
+    return write_if_changed(os.path.join(build_dir, SPLIT_CONTENTS_FILENAME), "".join(entries))
+
+
+def compile_units(executor: Executor, compile_unit: Callable[[str], CompileResult],
+                  tex_filepaths: List[str]) -> List[CompileResult]:
+    futures = [submit_in_context(executor, compile_unit, tex_filepath) for tex_filepath in tex_filepaths]
+    return [future.result() for future in futures]
+
+
+def compile_split_pdf(unit_names: List[str], build_dir: str, compile_unit: Callable[[str], CompileResult],
+                      jobs: Optional[int] = None) -> CompileResult:
+    start = time.perf_counter()
+    passes = 0
+    tex_filepaths = [os.path.join(build_dir, f"{name}.tex") for name in unit_names]
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        # Page numbers and the merged table of contents depend on the page count of every unit, and the front matter
+        # page count depends on the table of contents, so units are recompiled until both stop changing
+        for iteration in range(1, MAX_ITERATIONS + 1):
+            with profile(f"compile units iteration {iteration}"):
+                results = compile_units(executor, compile_unit, tex_filepaths)
+            passes += max(result.passes for result in results)
+            page_numbers_changed = update_page_numbers(unit_names, build_dir)
+            contents_changed = update_contents(unit_names, build_dir)
+            if not page_numbers_changed and not contents_changed:
+                break
+        else:
+            with profile("compile units final iteration"):
+                results = compile_units(executor, compile_unit, tex_filepaths)
+            passes += max(result.passes for result in results)
+    filepath = os.path.join(build_dir, "pld")
+    generate_merged_pld(unit_names).generate_tex(filepath)
+    with profile("pdflatex pld merge"):
+        run_pdflatex(f"{filepath}.tex", None)
+    return CompileResult(f"{filepath}.pdf", time.perf_counter() - start, passes + 1, None)
@@ -0,0 +1,70 @@
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from src.model import PLDRecord, UserStoryRecord
+from src.schema import Status
+
+STATUSES_BY_PRIORITY: List[Status] = sorted(Status, key=Status.to_priority, reverse=True)
+
+
+class AuthorIndex:
+    def __init__(self, authors: List[str]):
+        self.authors = authors
+        self._authors_set: Set[str] = set(authors)
+        self._resolved: Dict[str, Optional[str]] = dict()
+
+    def resolve(self, assignment: str) -> Optional[str]:
+        try:
+            return self._resolved[assignment]
+        except KeyError:
+            pass
+        # An exact name wins, otherwise a partial name belongs to the first author (in declaration order) containing it
+        if assignment in self._authors_set:
+            author = assignment
+        else:
+            author = next((author for author in self.authors if assignment in author), None)
+        self._resolved[assignment] = author
+        return author
+
+
+class StatusIndex(NamedTuple):
+    by_status: Dict[Status, List[UserStoryRecord]]
+    by_author: Dict[str, Dict[Status, List[UserStoryRecord]]]
+
+    def get_user_stories(self, author: str) -> List[UserStoryRecord]:
+        # Buckets are concatenated by decreasing priority, which keeps the schema order within a status without sorting
+        buckets = self.by_author.get(author, dict())
+        return [user_story for status in STATUSES_BY_PRIORITY for user_story in buckets.get(status, [])]
+
+
+class AuthorStats(NamedTuple):
+    total_man_days: float
+    man_days: Dict[str, float]
+    status_index: StatusIndex
+
+
+def aggregate_authors(schema: PLDRecord, author_index: Optional[AuthorIndex] = None) -> AuthorStats:
+    if author_index is None:
+        author_index = AuthorIndex(schema.authors)
+    man_days: Dict[str, float] = dict(zip(schema.authors, [float(0.0)] * len(schema.authors)))
+    by_status: Dict[Status, List[UserStoryRecord]] = {status: [] for status in STATUSES_BY_PRIORITY}
+    by_author: Dict[str, Dict[Status, List[UserStoryRecord]]] = dict()
+    total_man_days: float = float(0.0)
+    for deliverable in schema.deliverables:
+        for subset in deliverable.subsets:
+            for user_story in subset.user_stories:
+                total_man_days += user_story.estimated_duration
+                by_status[user_story.status].append(user_story)
+                if len(user_story.assignments) == 0:
+                    continue
+                estimated_man_days = user_story.estimated_duration / len(user_story.assignments)
+                assigned_authors: List[str] = []
+                for assignment in user_story.assignments:
+                    author = author_index.resolve(assignment)
+                    if author is None:
+                        continue
+                    man_days[author] += estimated_man_days
+                    if author not in assigned_authors:
+                        assigned_authors.append(author)
+                for author in assigned_authors:
+                    by_author.setdefault(author, dict()).setdefault(user_story.status, []).append(user_story)
+    return AuthorStats(total_man_days, man_days, StatusIndex(by_status, by_author))
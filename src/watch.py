@@ -0,0 +1,109 @@
+import contextlib
+import os
+import shutil
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.cache import compute_render_hash, write_render_hash
+from src.generator import FRAGMENTS_DIRNAME
+from src.logos import LOGO_SOURCE_FILENAMES, prepare_logos
+from src.loader import load_schema_incrementally, load_locale
+from src.profiling import Profiler, profile, profiling
+from src.render import RenderOptions, write_tex, compile_names
+from src.model import PLDRecord, to_record
+from src.schema import Deliverable, LocaleDictionary
+
+POLL_INTERVAL = 0.2
+DEBOUNCE_DELAY = 0.3
+
+
+def get_watched_filepaths(schema_filepath: str, assets_dir: str) -> List[str]:
+    directories = [str(Path(schema_filepath).parent), assets_dir]
+    return [schema_filepath] + [os.path.join(directory, source_filename) for directory in directories
+                                for source_filenames in LOGO_SOURCE_FILENAMES.values()
+                                for source_filename in source_filenames]
+
+
+def get_modification_times(filepaths: List[str]) -> Dict[str, Optional[float]]:
+    modification_times: Dict[str, Optional[float]] = dict()
+    for filepath in filepaths:
+        try:
+            modification_times[filepath] = os.stat(filepath).st_mtime
+        except FileNotFoundError:
+            modification_times[filepath] = None
+    return modification_times
+
+
+def wait_for_changes(filepaths: List[str],
+                     modification_times: Dict[str, Optional[float]]) -> Dict[str, Optional[float]]:
+    while get_modification_times(filepaths) == modification_times:
+        time.sleep(POLL_INTERVAL)
+    # Editors often write a file in several steps, wait until the burst of writes is over
+    new_modification_times = get_modification_times(filepaths)
+    while True:
+        time.sleep(DEBOUNCE_DELAY)
+        latest_modification_times = get_modification_times(filepaths)
+        if latest_modification_times == new_modification_times:
+            return latest_modification_times
+        new_modification_times = latest_modification_times
+
+
+def diff_schemas(previous: Optional[PLDRecord], schema: PLDRecord) -> List[str]:
+    if previous is None:
+        return ["everything"]
+    changes = [field for field in ["locale", "title", "subtitle", "description", "authors", "versions"]
+               if getattr(previous, field) != getattr(schema, field)]
+    for n_deliverable, deliverable in enumerate(schema.deliverables, start=1):
+        if n_deliverable > len(previous.deliverables) or previous.deliverables[n_deliverable - 1] != deliverable:
+            changes.append(f"deliverable {n_deliverable} ({deliverable.name})")
+    if len(previous.deliverables) > len(schema.deliverables):
+        changes.append(f"{len(previous.deliverables) - len(schema.deliverables)} removed deliverables")
+    return changes
+
+
+def watch(schema_filepath: str, build_dir: str = "build", options: RenderOptions = RenderOptions(),
+          profile_filename: Optional[str] = None) -> None:
+    os.makedirs(build_dir, exist_ok=True)
+    if options.force:
+        shutil.rmtree(os.path.join(build_dir, FRAGMENTS_DIRNAME), ignore_errors=True)
+    filepaths = get_watched_filepaths(schema_filepath, options.assets_dir)
+    modification_times: Dict[str, Optional[float]] = dict()
+    previous_schema: Optional[PLDRecord] = None
+    previous_logo_filepaths: List[Optional[str]] = []
+    deliverables: Dict[str, Deliverable] = dict()
+    locale: Optional[LocaleDictionary] = None
+    print(f"Watching {schema_filepath}, press Ctrl+C to stop")
+    while True:
+        modification_times = wait_for_changes(filepaths, modification_times)
+        start = time.perf_counter()
+        profiler = Profiler() if profile_filename is not None else None
+        try:
+            with profiling(profiler) if profiler is not None else contextlib.nullcontext():
+                validated_schema, deliverables = load_schema_incrementally(schema_filepath, deliverables)
+                # Records have their versions sorted, so reordering versions is not reported as a change
+                with profile("to_record"):
+                    schema = to_record(validated_schema)
+                logo_filepaths = prepare_logos(schema_filepath, options.assets_dir, build_dir)
+                changes = diff_schemas(previous_schema, schema)
+                if previous_schema is not None and logo_filepaths != previous_logo_filepaths:
+                    changes.append("logos")
+                if len(changes) == 0:
+                    continue
+                if locale is None or previous_schema is None or previous_schema.locale != schema.locale:
+                    locale = load_locale(schema)
+                names = write_tex(schema, locale, build_dir, options.split, options.breakable)
+                print(f"{', '.join(changes)} changed, TeX updated in {time.perf_counter() - start:.2f}s")
+                with profile("compile"):
+                    result = compile_names(names, build_dir, options.compile_address, options.split)
+                write_render_hash(build_dir, compute_render_hash(schema, locale, logo_filepaths, options.breakable,
+                                                                 options.split))
+                print(f"PDF updated in {time.perf_counter() - start:.2f}s ({result.passes} LaTeX passes)")
+                previous_schema, previous_logo_filepaths = schema, logo_filepaths
+            if profiler is not None:
+                profiler.save(os.path.join(build_dir, profile_filename))
+        except (FileNotFoundError, ValueError):
+            print(traceback.format_exc(limit=0))
+        except Exception:
+            print(traceback.format_exc())